@@ -15,12 +15,29 @@ DESCRIPTION:
 """
 
 import streamlit as st
-from fpdf import FPDF
-import tempfile
-import os
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import re
+import os
+import hmac
+import sys
+import json
+import time
+import stat
+import atexit
+import shutil
+import tempfile
+import threading
+import multiprocessing
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
+from pdf_engine import (SECTIONS, build_pdf_resume, pdf_to_bytes,
+                        parse_variant_specs, build_resume_variants_zip)
+
 # =============================================================================
 # 1. APP CONFIGURATION & CONSTANTS
 # =============================================================================
@@ -34,7 +51,20 @@ st.set_page_config(
 
 # Constants for Validation & Limits
 MAX_SUMMARY_CHARS = 2000
-SECTIONS = ['experience', 'projects', 'education', 'certs', 'skills', 'languages']
+MAX_VARIANT_WORKERS = 4  # Worker processes for tailored variants (capped by CPU count)
+OPTIMIZE_PDF_OUTPUT = False  # Default for the "Compact PDF" switch (opt-in)
+
+# Session Memory Governor
+MEMORY_CEILING_BYTES = 256 * 1024 * 1024  # All sessions of this process together
+IDLE_COMPACT_SECONDS = 300  # Idle time before a session's state is compacted
+GOVERNOR_SWEEP_SECONDS = 10  # Minimum time between idle sweeps
+# Streamlit keeps a disconnected session for 2 minutes (MemorySessionStorage TTL) so that the tab can
+# reconnect with the same id and state; the governor waits a little longer before forgetting it.
+DISCONNECTED_KEEP_SECONDS = 150
+DRAFT_TTL_SECONDS = 24 * 3600  # Evicted drafts older than this are deleted
+# Directory for evicted drafts: None creates a private (0700) temporary directory per
+# server process. A configured directory must be owned by the server user with mode 0700.
+DRAFT_STORE_DIR = None
 
 
 # =============================================================================
@@ -168,33 +198,216 @@ load_css()
 # 3. UTILITIES & VALIDATION
 # =============================================================================
 
-def clean_text(text: str) -> str:
+def validate_email(email: str) -> bool:
+    """Checks if the email format is valid using Regex."""
+    return FIELD_PATTERNS['email'].match(email) is not None
+
+
+def estimate_size(obj, _seen=None) -> int:
+    """Approximate memory held by an object graph (dicts, lists, strings, bytes), in bytes."""
+    _seen = set() if _seen is None else _seen
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, _seen) for v in obj)
+    return size
+
+
+def parse_tags(raw: str) -> list:
+    """Turns a comma separated tag string into a lowercase, de-duplicated list."""
+    tags = []
+    for tag in (raw or "").split(','):
+        tag = tag.strip().lstrip('#').lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+# =============================================================================
+# 3b. DECLARATIVE VALIDATION ENGINE
+# =============================================================================
+# Rules are plain data; regexes are compiled once per process at import time.
+
+MONTH_INDEX = {m: i for i, m in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+_MONTH = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+
+FIELD_PATTERNS = {
+    'email': re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"),
+    'phone': re.compile(r"^\+?(?=(?:\D*\d){7,15}\D*$)[\d\s().-]+$"),
+    'linkedin': re.compile(r"^(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[\w%-]+/?$", re.IGNORECASE),
+    'github': re.compile(r"^(?:https?://)?(?:www\.)?github\.com/[\w-]+(?:/[\w.-]+)?/?$", re.IGNORECASE),
+    'date': re.compile(
+        rf"^(?P<start>(?:{_MONTH}\s+)?\d{{4}})"
+        rf"(?:\s*[-–—]\s*(?P<end>(?:{_MONTH}\s+)?\d{{4}}|present|current|now))?$",
+        re.IGNORECASE),
+}
+
+PATTERN_MESSAGES = {
+    'email': "format is invalid.",
+    'phone': "should contain 7-15 digits, e.g. +20 123 456 7890.",
+    'linkedin': "should look like linkedin.com/in/your-name.",
+    'github': "should look like github.com/your-name.",
+    'date': 'should look like "Jan 2023 - Present", "2020 - 2024" or "2024".',
+}
+
+# Personal information widgets (keyed so they can be validated incrementally)
+FIELD_RULES = {
+    'p_name': {'label': 'Full Name', 'required': True, 'max_len': 80},
+    'p_email': {'label': 'Email', 'required': True, 'max_len': 120, 'pattern': 'email'},
+    'p_phone': {'label': 'Phone', 'max_len': 30, 'pattern': 'phone'},
+    'p_location': {'label': 'Location', 'max_len': 80},
+    'p_linkedin': {'label': 'LinkedIn URL', 'max_len': 200, 'pattern': 'linkedin'},
+    'p_github': {'label': 'GitHub URL', 'max_len': 200, 'pattern': 'github'},
+    'p_summary': {'label': 'Professional Summary', 'max_len': MAX_SUMMARY_CHARS},
+}
+PERSONAL_FIELDS = list(FIELD_RULES)
+
+# Section input widgets: prefix -> label per section, rules shared per prefix
+SECTION_FIELDS = {
+    'experience': {'t': 'Job Title', 'c': 'Company', 'd': 'Date', 'desc': 'Description', 'g': 'Tags'},
+    'projects': {'t': 'Project Name', 'd': 'Date', 'desc': 'Description', 'g': 'Tags'},
+    'education': {'t': 'Degree', 'c': 'Institution', 'd': 'Date'},
+    'certs': {'t': 'Certification Name', 'c': 'Issuing Authority', 'd': 'Date'},
+    'skills': {'t': 'Item Name'},
+    'languages': {'t': 'Item Name'},
+}
+SECTION_FIELD_RULES = {
+    't': {'max_len': 120},
+    'c': {'max_len': 120},
+    'd': {'max_len': 40, 'pattern': 'date', 'advisory': True},  # Unusual dates are printed as typed
+    'desc': {'max_len': 3000},
+    'g': {'max_len': 200},
+}
+for _section, _fields in SECTION_FIELDS.items():
+    for _prefix, _label in _fields.items():
+        FIELD_RULES[f"{_prefix}_{_section}"] = {'label': _label, **SECTION_FIELD_RULES[_prefix]}
+
+# Sections whose items should be listed most recent first
+CHRONOLOGICAL_SECTIONS = ['experience', 'projects', 'education']
+
+
+def parse_date_range(text: str):
     """
-    Sanitizes text to ensure PDF compatibility (Latin-1 encoding).
-    Replaces smart quotes, dashes, and other non-standard chars.
+    Parses a date string like "Jan 2023 - Present" into ((year, month), (year, month)).
+    Returns None when the format is not recognised. Open ranges end at (9999, 12).
     """
-    if not text:
-        return ""
-
-    replacements = {
-        '–': '-', '—': '-',
-        '“': '"', '”': '"',
-        '’': "'", '‘': "'",
-        '…': '...',
-        '•': '-'  # Bullets handled manually in PDF engine
-    }
+    match = FIELD_PATTERNS['date'].match((text or "").strip())
+    if not match:
+        return None
+
+    def to_point(part, default_month):
+        words = part.split()
+        if len(words) == 2:
+            return int(words[1]), MONTH_INDEX[words[0][:3].lower()]
+        return int(words[0]), default_month
+
+    start = to_point(match.group('start'), 1)
+    end_raw = match.group('end')
+    if end_raw is None:
+        end = to_point(match.group('start'), 12)
+    elif end_raw.lower() in ('present', 'current', 'now'):
+        end = (9999, 12)
+    else:
+        end = to_point(end_raw, 12)
+    return start, end
+
+
+def run_field_rules(field_key: str, value: str) -> tuple:
+    """
+    Applies the declarative rules of one field. Returns (errors, warnings);
+    a pattern mismatch on an 'advisory' field is only a warning.
+    """
+    rules = FIELD_RULES.get(field_key)
+    if not rules:
+        return [], []
+
+    label = rules['label']
+    value = (value or "").strip()
+    if not value:
+        return ([f"{label} is missing."] if rules.get('required') else []), []
+
+    errors, warnings = [], []
+    if len(value) > rules.get('max_len', len(value)):
+        errors.append(f"{label} is too long ({len(value)} / {rules['max_len']} characters).")
+
+    pattern = rules.get('pattern')
+    if pattern and not FIELD_PATTERNS[pattern].match(value):
+        if rules.get('advisory'):
+            warnings.append(f"{label} {PATTERN_MESSAGES[pattern]} It is printed as typed.")
+        else:
+            errors.append(f"{label} {PATTERN_MESSAGES[pattern]}")
+    elif pattern == 'date':
+        start, end = parse_date_range(value)
+        if start > end:
+            errors.append(f"{label} starts after it ends.")
+
+    return errors, warnings
 
-    for old, new in replacements.items():
-        text = text.replace(old, new)
 
-    # Final safety encoding
-    return text.encode('latin-1', 'replace').decode('latin-1')
+def validate_fields(field_keys) -> dict:
+    """
+    Incremental validation: only fields whose value changed since the last
+    rerun are re-checked, the rest are served from the session cache.
+    Returns {field_key: (errors, warnings)}.
+    """
+    cache = st.session_state.setdefault('_field_validation', {})
+    results = {}
+    for key in field_keys:
+        value = st.session_state.get(key, "") or ""
+        cached = cache.get(key)
+        if cached is None or cached[0] != value:
+            cached = cache[key] = (value, run_field_rules(key, value))
+        results[key] = cached[1]
+    return results
+
+
+def validate_section_items(section_key) -> tuple:
+    """
+    Checks the saved items of a section: date formats and, for chronological
+    sections, most-recent-first ordering. Returns (errors, warnings).
+    Cached on the section's dates so unchanged sections are not re-checked.
+    """
+    dates = tuple(item.get('date', '') for item in st.session_state[section_key])
+    cache = st.session_state.setdefault('_section_validation', {})
+    cached = cache.get(section_key)
+    if cached is not None and cached[0] == dates:
+        return cached[1]
+
+    errors, warnings = [], []
+    title = section_key.capitalize()
+    starts = []
+    for i, date in enumerate(dates, start=1):
+        if not date:
+            continue
+        parsed = parse_date_range(date)
+        if parsed is None:
+            warnings.append(f"{title} item {i}: Date {PATTERN_MESSAGES['date']} "
+                            f"It is printed as typed and not checked for ordering.")
+        elif parsed[0] > parsed[1]:
+            errors.append(f"{title} item {i}: Date starts after it ends.")
+        else:
+            starts.append((i, parsed[0]))
 
+    if section_key in CHRONOLOGICAL_SECTIONS:
+        for (prev_i, prev_start), (i, start) in zip(starts, starts[1:]):
+            if start > prev_start:
+                warnings.append(f"{title} item {i} is more recent than item {prev_i}; "
+                                f"ATS parsers expect the most recent first.")
 
-def validate_email(email: str) -> bool:
-    """Checks if the email format is valid using Regex."""
-    pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-    return re.match(pattern, email) is not None
+    cache[section_key] = (dates, (errors, warnings))
+    return errors, warnings
+
+
+def draft_field_errors(section_key) -> list:
+    """Returns the rule violations of a section's input widgets."""
+    keys = [f"{prefix}_{section_key}" for prefix in SECTION_FIELDS[section_key]]
+    return [err for errs, _warnings in validate_fields(keys).values() for err in errs]
 
 
 # =============================================================================
@@ -209,33 +422,41 @@ for key in SECTIONS:
 if 'edit_target' not in st.session_state:
     st.session_state.edit_target = None
 
+if 'compact_pdf' not in st.session_state:
+    st.session_state.compact_pdf = OPTIMIZE_PDF_OUTPUT
+
 
 # =============================================================================
 # 5. CALLBACK FUNCTIONS (STABILITY LAYER)
 # =============================================================================
 # Using callbacks prevents Streamlit form crashing by updating state *before* re-run.
+# Callbacks run before the script body, so each one first restores state the
+# memory governor may have compacted (see section 5b).
 
 def add_item_callback(section_key):
+    restore_session_state()
     # Retrieve values from widget state keys
     t_key, c_key, d_key, desc_key = f"t_{section_key}", f"c_{section_key}", f"d_{section_key}", f"desc_{section_key}"
+    g_key = f"g_{section_key}"
 
     v1 = st.session_state.get(t_key, "").strip()
     v2 = st.session_state.get(c_key, "").strip()
     v3 = st.session_state.get(d_key, "").strip()
     v4 = st.session_state.get(desc_key, "").strip()
+    tags = parse_tags(st.session_state.get(g_key, ""))
 
     valid_entry = False
     new_item = {}
 
     # Logic to build item dict based on section type
     if section_key == 'experience' and v1:
-        new_item = {'title': v1, 'company': v2, 'date': v3, 'desc': v4}
+        new_item = {'title': v1, 'company': v2, 'date': v3, 'desc': v4, 'tags': tags}
         valid_entry = True
     elif section_key == 'education' and v1:
         new_item = {'degree': v1, 'school': v2, 'date': v3}
         valid_entry = True
     elif section_key == 'projects' and v1:
-        new_item = {'title': v1, 'date': v3, 'desc': v4}
+        new_item = {'title': v1, 'date': v3, 'desc': v4, 'tags': tags}
         valid_entry = True
     elif section_key == 'certs' and v1:
         new_item = {'name': v1, 'authority': v2, 'date': v3}
@@ -244,10 +465,15 @@ def add_item_callback(section_key):
         new_item = {'text': v1}
         valid_entry = True
 
-    if valid_entry:
+    # Block entries that break the field rules (details are shown inline)
+    field_errors = draft_field_errors(section_key) if valid_entry else []
+
+    if field_errors:
+        st.toast(f"⚠️ {field_errors[0]}", icon="🚨")
+    elif valid_entry:
         st.session_state[section_key].append(new_item)
         # Clear inputs securely
-        for k in [t_key, c_key, d_key, desc_key]:
+        for k in [t_key, c_key, d_key, desc_key, g_key]:
             if k in st.session_state: st.session_state[k] = ""
         st.toast(f"✅ Added to {section_key.capitalize()}")
     else:
@@ -255,42 +481,53 @@ def add_item_callback(section_key):
 
 
 def save_changes_callback(section_key, idx):
+    restore_session_state()
     t_key, c_key, d_key, desc_key = f"t_{section_key}", f"c_{section_key}", f"d_{section_key}", f"desc_{section_key}"
+    g_key = f"g_{section_key}"
     v1 = st.session_state.get(t_key, "").strip()
     v2 = st.session_state.get(c_key, "").strip()
     v3 = st.session_state.get(d_key, "").strip()
     v4 = st.session_state.get(desc_key, "").strip()
+    tags = parse_tags(st.session_state.get(g_key, ""))
 
     new_item = {}
     if section_key == 'experience':
-        new_item = {'title': v1, 'company': v2, 'date': v3, 'desc': v4}
+        new_item = {'title': v1, 'company': v2, 'date': v3, 'desc': v4, 'tags': tags}
     elif section_key == 'education':
         new_item = {'degree': v1, 'school': v2, 'date': v3}
     elif section_key == 'projects':
-        new_item = {'title': v1, 'date': v3, 'desc': v4}
+        new_item = {'title': v1, 'date': v3, 'desc': v4, 'tags': tags}
     elif section_key == 'certs':
         new_item = {'name': v1, 'authority': v2, 'date': v3}
     else:
         new_item = {'text': v1}
 
+    field_errors = draft_field_errors(section_key)
+    if field_errors:
+        st.toast(f"⚠️ {field_errors[0]}", icon="🚨")
+        return
+
     st.session_state[section_key][idx] = new_item
     st.session_state.edit_target = None  # Exit edit mode
 
     # Clear inputs
-    for k in [t_key, c_key, d_key, desc_key]:
+    for k in [t_key, c_key, d_key, desc_key, g_key]:
         if k in st.session_state: st.session_state[k] = ""
     st.toast("💾 Changes Saved Successfully")
 
 
 def cancel_edit_callback(section_key):
+    restore_session_state()
     st.session_state.edit_target = None
     # Clear inputs
     t_key, c_key, d_key, desc_key = f"t_{section_key}", f"c_{section_key}", f"d_{section_key}", f"desc_{section_key}"
-    for k in [t_key, c_key, d_key, desc_key]:
+    g_key = f"g_{section_key}"
+    for k in [t_key, c_key, d_key, desc_key, g_key]:
         if k in st.session_state: st.session_state[k] = ""
 
 
 def delete_item_callback(section_key, idx):
+    restore_session_state()
     st.session_state[section_key].pop(idx)
     # If we were editing the item we just deleted, cancel edit mode
     if st.session_state.edit_target and \
@@ -302,6 +539,7 @@ def delete_item_callback(section_key, idx):
 
 def trigger_edit_callback(section_key, idx):
     """Populates the input fields with the existing data for editing."""
+    restore_session_state()
     st.session_state.edit_target = {'section': section_key, 'index': idx}
     item = st.session_state[section_key][idx]
 
@@ -311,6 +549,7 @@ def trigger_edit_callback(section_key, idx):
         st.session_state[f"c_{section_key}"] = item['company']
         st.session_state[f"d_{section_key}"] = item['date']
         st.session_state[f"desc_{section_key}"] = item['desc']
+        st.session_state[f"g_{section_key}"] = ", ".join(item.get('tags', []))
     elif section_key == 'education':
         st.session_state[f"t_{section_key}"] = item['degree']
         st.session_state[f"c_{section_key}"] = item['school']
@@ -319,6 +558,7 @@ def trigger_edit_callback(section_key, idx):
         st.session_state[f"t_{section_key}"] = item['title']
         st.session_state[f"d_{section_key}"] = item['date']
         st.session_state[f"desc_{section_key}"] = item['desc']
+        st.session_state[f"g_{section_key}"] = ", ".join(item.get('tags', []))
     elif section_key == 'certs':
         st.session_state[f"t_{section_key}"] = item['name']
         st.session_state[f"c_{section_key}"] = item['authority']
@@ -328,181 +568,293 @@ def trigger_edit_callback(section_key, idx):
 
 
 # =============================================================================
-# 6. ATS PDF GENERATION ENGINE
+# 5b. SESSION MEMORY GOVERNOR
 # =============================================================================
 
-class UltimateATSPDF(FPDF):
+# Session keys that make up a user's draft (serialized on compaction / eviction).
+# Widget values are left alone: Streamlit owns them and the browser re-sends them on every rerun.
+DRAFT_KEYS = SECTIONS + ['edit_target']
+# Session keys that are simply dropped: validation caches (rebuilt on the next rerun)
+VOLATILE_KEYS = ['_field_validation', '_section_validation']
+
+
+class SessionMemoryGovernor:
     """
-    Custom PDF Class designed specifically for ATS Parsing.
-    - Uses Standard Fonts (Times)
-    - Linear Layout (Top to Bottom)
-    - Metadata Injection
+    Process-wide tracker of per-session state size.
+    - Sessions idle for `idle_seconds` are compacted: their saved items are
+      serialized (JSON + zlib) and removed from session state, and the
+      validation caches are dropped.
+    - Above `ceiling_bytes`, the least recently used sessions are evicted to
+      the draft store on disk (private directory, files readable by the server user only).
+    - Compacted or evicted state is restored on the session's next rerun.
+    - Sessions disconnected for longer than Streamlit keeps them are forgotten
+      after their draft was written to the draft store (it expires there).
     """
 
-    def header(self):
-        # No graphical header to confuse ATS
-        pass
-
-    def footer(self):
-        # Simple footer with page number
-        self.set_y(-15)
-        self.set_font('Times', '', 9)
-        self.set_text_color(128, 128, 128)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-
-    def draw_section_title(self, title):
-        """Draws a section header with a clean separator line."""
-        self.ln(6)
-        self.set_font('Times', 'B', 11)
-        self.set_text_color(0, 0, 0)  # Black
-        self.cell(0, 6, title.upper(), 0, 1, 'L')
-        self.set_draw_color(0, 0, 0)  # Black Line
-        self.line(10, self.get_y(), 200, self.get_y())
-        self.ln(2)
-
-    def draw_complex_item(self, title, subtitle, date, description, is_list=True):
+    def __init__(self, ceiling_bytes, idle_seconds, draft_dir=None):
+        self.ceiling_bytes = ceiling_bytes
+        self.idle_seconds = idle_seconds
+        self.draft_dir = self._open_draft_store(draft_dir)
+        self._sessions = OrderedDict()  # session_id -> entry, least recently used first
+        self._lock = threading.RLock()  # Guards _sessions; never held during file I/O
+        self._store_lock = threading.RLock()  # Serializes draft file I/O
+        self._next_sweep = 0.0
+
+    # --- Session lifecycle ---
+
+    def begin_run(self, session_id, state):
+        """Marks a session as running; returns its saved draft if it must be restored."""
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:  # New, or forgotten after a disconnect: look in the draft store
+                entry = {'bytes': 0, 'blob': None, 'status': 'evicted'}
+            self._sessions[session_id] = entry  # Most recently used
+            entry.update(state=state, running=True, last_active=time.monotonic())
+            entry.pop('forget', None)
+            entry.pop('disconnected_at', None)
+            status, blob = entry['status'], entry['blob']
+            entry.update(status='active', blob=None)
+
+        if status == 'active':
+            return None
+        if blob is None:  # Evicted and already written to the draft store
+            blob = self._load_draft(session_id)
+        return json.loads(zlib.decompress(blob)) if blob else None
+
+    def end_run(self, session_id, state_bytes):
+        """Records the session's state size, then applies the idle and ceiling policies."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return
+            entry.update(bytes=state_bytes, running=False, last_active=time.monotonic())
+            sweep, evicted = self._enforce()
+
+        # Draft store work is done after releasing the lock, so other sessions never wait on the disk
+        for evicted_id, evicted_entry, blob in evicted:
+            self._write_draft(evicted_id, evicted_entry, blob)
+        if sweep:
+            self._delete_expired_drafts()
+
+    # --- Policies ---
+
+    def _busy(self, entry, now):
+        # A run that never finished (e.g. a callback raised) stops counting after the idle window
+        return entry['running'] and now - entry['last_active'] < self.idle_seconds
+
+    def _enforce(self):
+        """
+        Applies the policies in memory (caller holds the lock). Returns
+        (swept, [(session_id, entry, blob) to write to the draft store]).
         """
-        Renders an item with Title (Left), Date (Right), Subtitle (Left), and Description.
-        This layout is optimized for parsing logic.
+        now = time.monotonic()
+        sweep, evicted = now >= self._next_sweep, []
+        if sweep:
+            self._next_sweep = now + GOVERNOR_SWEEP_SECONDS
+            evicted = self._release_closed_sessions(now)
+            for entry in self._sessions.values():
+                if entry['status'] == 'active' and not self._busy(entry, now) and \
+                        now - entry['last_active'] > self.idle_seconds:
+                    self._compact(entry)
+
+        # Global ceiling: evict least recently used sessions to the draft store
+        total = self.total_bytes()
+        for session_id, entry in list(self._sessions.items()):
+            if total <= self.ceiling_bytes:
+                break
+            if entry['status'] == 'evicted' or self._busy(entry, now):
+                continue
+            held = entry['bytes']
+            self._evict(entry)
+            evicted.append((session_id, entry, entry['blob']))
+            total -= held - (entry['bytes'] - len(entry['blob']))  # As if already written
+        return sweep, evicted
+
+    def _compact(self, entry):
+        state = entry['state']
+        snapshot = {key: state[key] for key in DRAFT_KEYS if key in state}
+        entry.update(status='compacted', blob=zlib.compress(json.dumps(snapshot).encode('utf-8')))
+        for key in list(snapshot) + VOLATILE_KEYS:
+            if key in state:
+                del state[key]
+        entry['bytes'] = len(entry['blob']) + estimate_size(state.filtered_state)
+
+    def _evict(self, entry):
+        # The blob stays in memory until _write_draft has stored it
+        if entry['status'] == 'active':
+            self._compact(entry)
+        entry.update(status='evicted', state=None)
+
+    def _release_closed_sessions(self, now):
         """
-        # Line 1: Title & Date
-        self.set_font('Times', 'B', 10)
-        self.set_text_color(0, 0, 0)
+        Forgets sessions disconnected for longer than Streamlit keeps them for a
+        reconnect. Drafts still in memory are evicted first; the entry is dropped
+        once the draft is on disk. Returns the drafts to write.
+        """
+        if not runtime.exists():
+            return []
+        active = runtime.get_instance().is_active_session
+        evicted = []
+        for session_id, entry in list(self._sessions.items()):
+            if active(session_id):
+                entry.pop('disconnected_at', None)
+                continue
+            since = entry.setdefault('disconnected_at', now)
+            if now - since < DISCONNECTED_KEEP_SECONDS or self._busy(entry, now):
+                continue
+            if entry['status'] == 'evicted' and entry['blob'] is None:
+                del self._sessions[session_id]  # Already in the draft store
+                continue
+            self._evict(entry)
+            entry['forget'] = True
+            evicted.append((session_id, entry, entry['blob']))
+        return evicted
+
+    # --- Draft store (called without the session lock) ---
+
+    @staticmethod
+    def _open_draft_store(path):
+        """Returns the draft directory, creating a private temporary one when none is configured."""
+        if path is None:
+            path = tempfile.mkdtemp(prefix="ats_resume_drafts-")  # Mode 0700, unpredictable name
+            atexit.register(shutil.rmtree, path, ignore_errors=True)
+            return path
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            raise RuntimeError(f"Draft store {path} must be a directory owned by the server user with mode 0700.")
+        return path
+
+    def _draft_path(self, session_id):
+        return os.path.join(self.draft_dir, re.sub(r"[^\w-]", "", session_id) + ".json.z")
+
+    def _is_pending(self, session_id, entry, blob):
+        with self._lock:
+            return self._sessions.get(session_id) is entry and entry['blob'] is blob
+
+    def _write_draft(self, session_id, entry, blob):
+        """Stores an evicted draft, then frees its in-memory copy (unless the session came back meanwhile)."""
+        with self._store_lock:
+            if not self._is_pending(session_id, entry, blob):
+                return
+            try:
+                fd = os.open(self._draft_path(session_id), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW,
+                             0o600)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(blob)
+            except OSError:
+                return  # The draft simply stays in memory
+            with self._lock:
+                if self._is_pending(session_id, entry, blob):
+                    entry.update(blob=None, bytes=entry['bytes'] - len(blob))
+                    if entry.get('forget'):
+                        del self._sessions[session_id]
+                    return
+            self._delete_draft(session_id)
+
+    def _load_draft(self, session_id):
+        with self._store_lock:
+            try:
+                with open(self._draft_path(session_id), 'rb') as f:
+                    blob = f.read()
+                os.unlink(self._draft_path(session_id))
+            except FileNotFoundError:
+                return None
+        return blob
+
+    def _delete_draft(self, session_id):
+        with self._store_lock:
+            try:
+                os.unlink(self._draft_path(session_id))
+            except FileNotFoundError:
+                pass
+
+    def _delete_expired_drafts(self):
+        cutoff = time.time() - DRAFT_TTL_SECONDS
+        with self._store_lock, os.scandir(self.draft_dir) as files:
+            for draft in files:
+                if draft.name.endswith(".json.z") and draft.stat().st_mtime < cutoff:
+                    os.unlink(draft.path)
+
+    # --- Monitoring ---
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry['bytes'] for entry in self._sessions.values())
+
+    def stats(self):
+        """Per-session memory and totals, for monitoring."""
+        with self._lock:
+            now = time.monotonic()
+            sessions = [{'session': session_id[:8], 'status': entry['status'], 'bytes': entry['bytes'],
+                         'idle_s': round(now - entry['last_active'])}
+                        for session_id, entry in reversed(self._sessions.items())]
+        counts = {status: sum(1 for row in sessions if row['status'] == status)
+                  for status in ('active', 'compacted', 'evicted')}
+        return {'total_bytes': sum(row['bytes'] for row in sessions), 'ceiling_bytes': self.ceiling_bytes,
+                'counts': counts, 'sessions': sessions}
+
+
+@st.cache_resource(show_spinner=False)
+def get_memory_governor():
+    """One governor per server process, shared by all sessions."""
+    return SessionMemoryGovernor(MEMORY_CEILING_BYTES, IDLE_COMPACT_SECONDS, DRAFT_STORE_DIR)
+
+
+def restore_session_state():
+    """Registers the current run with the governor and restores compacted/evicted state."""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    snapshot = get_memory_governor().begin_run(ctx.session_id, ctx.session_state)
+    if snapshot:
+        for key, value in snapshot.items():
+            st.session_state[key] = value
+        st.toast("📂 Your draft was restored.")
+
+
+def release_session_state():
+    """Reports the session's state size at the end of a run."""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    get_memory_governor().end_run(ctx.session_id, estimate_size(st.session_state.to_dict()))
 
-        # Calculate width to prevent overlapping
-        title_w = 140 if date else 190
 
-        # Draw Title
-        self.cell(title_w, 5, clean_text(title), 0, 0, 'L')
+# =============================================================================
+# 6. PDF GENERATION (ENGINE IN pdf_engine.py)
+# =============================================================================
+# The layout, compact output and variant selection live in pdf_engine.py,
+# which does not import Streamlit, so worker processes can load it.
+
+@st.cache_resource(show_spinner=False)
+def get_render_pool():
+    """
+    Worker processes shared by all sessions for rendering tailored variants.
+    Returns None on a single CPU, where variants render in the script thread.
+    """
+    workers = min(MAX_VARIANT_WORKERS, os.cpu_count() or 1)
+    if workers < 2:
+        return None
+    # Forking a threaded server is unsafe; spawned workers import this script
+    # once in bare mode (main() does not run) and then only run the engine.
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
 
-        # Draw Date (Aligned Right)
-        if date:
-            self.set_font('Times', '', 10)
-            self.cell(0, 5, clean_text(date), 0, 1, 'R')
-        else:
-            self.ln(5)  # Just finish the line
-
-        # Line 2: Subtitle (Company / Institution)
-        if subtitle:
-            self.set_font('Times', 'I', 10)  # Italics for distinction
-            self.cell(0, 5, clean_text(subtitle), 0, 1, 'L')
-
-        # Line 3: Description (Bullets)
-        if description:
-            self.set_font('Times', '', 10)
-            lines = description.strip().split('\n')
-            for line in lines:
-                if line.strip():
-                    # Manual Bullet Point Drawing for consistency
-                    clean_line = line.strip().replace('-', '').replace('•', '').strip()
-
-                    if is_list:
-                        current_y = self.get_y()
-                        self.set_xy(12, current_y)  # Indent
-                        self.cell(4, 5, chr(149), 0, 0)  # Bullet Char
-                        self.set_xy(16, current_y)
-                        self.multi_cell(0, 5, clean_text(clean_line))
-                    else:
-                        self.multi_cell(0, 5, clean_text(clean_line))
-
-        self.ln(2)  # Spacing after item
-
-    def draw_simple_list(self, text):
-        """Renders simple bullet points (Skills / Languages)."""
-        self.set_font('Times', '', 10)
-        current_y = self.get_y()
-        self.set_xy(12, current_y)
-        self.cell(4, 5, chr(149), 0, 0)
-        self.set_xy(16, current_y)
-        self.multi_cell(0, 5, clean_text(text))
-
-
-def build_pdf_resume(personal_info, sections_data):
-    """Orchestrates the PDF creation process."""
-
-    pdf = UltimateATSPDF(orientation='P', unit='mm', format='A4')
-
-    # ATS Metadata Injection
-    pdf.set_title(f"{clean_text(personal_info['name'])} Resume")
-    pdf.set_author(clean_text(personal_info['name']))
-    pdf.set_creator("Saif's Ultimate Resume Builder")
-    pdf.set_keywords("Resume, CV, ATS, Software Engineer, Developer")
-
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-
-    # --- 1. HEADER (Contact Info) ---
-    pdf.set_font('Times', 'B', 18)
-    pdf.cell(0, 8, clean_text(personal_info['name'].upper()), 0, 1, 'C')
-
-    pdf.set_font('Times', '', 10)
-
-    # Smart joining of contact info to avoid empty pipes
-    contact_list = [
-        personal_info['location'],
-        personal_info['phone'],
-        personal_info['email']
-    ]
-    contact_string = " | ".join([c for c in contact_list if c])
-    pdf.cell(0, 5, clean_text(contact_string), 0, 1, 'C')
-
-    # Links
-    links_list = [
-        personal_info['linkedin'],
-        personal_info['github']
-    ]
-    links_string = " | ".join([l for l in links_list if l])
-    if links_string:
-        pdf.cell(0, 5, clean_text(links_string), 0, 1, 'C')
-
-    pdf.ln(5)
-
-    # --- 2. SUMMARY ---
-    if personal_info['summary']:
-        pdf.draw_section_title('Professional Summary')
-        pdf.set_font('Times', '', 10)
-        pdf.multi_cell(0, 5, clean_text(personal_info['summary']))
-
-    # --- 3. SECTIONS ITERATION ---
-    # Defined order for best ATS results
-
-    # Skills first (High relevance)
-    if sections_data['skills']:
-        pdf.draw_section_title('Technical Skills')
-        for item in sections_data['skills']:
-            pdf.draw_simple_list(item['text'])
-
-    # Experience
-    if sections_data['experience']:
-        pdf.draw_section_title('Professional Experience')
-        for item in sections_data['experience']:
-            pdf.draw_complex_item(item['title'], item['company'], item['date'], item['desc'], is_list=True)
-
-    # Projects
-    if sections_data['projects']:
-        pdf.draw_section_title('Technical Projects')
-        for item in sections_data['projects']:
-            pdf.draw_complex_item(item['title'], None, item['date'], item['desc'], is_list=True)
-
-    # Education
-    if sections_data['education']:
-        pdf.draw_section_title('Education')
-        for item in sections_data['education']:
-            pdf.draw_complex_item(item['degree'], item['school'], item['date'], None, is_list=False)
-
-    # Certifications
-    if sections_data['certs']:
-        pdf.draw_section_title('Certifications')
-        for item in sections_data['certs']:
-            pdf.draw_complex_item(item['name'], item['authority'], item['date'], None, is_list=False)
-
-    # Languages
-    if sections_data['languages']:
-        pdf.draw_section_title('Languages')
-        for item in sections_data['languages']:
-            pdf.draw_simple_list(item['text'])
-
-    return pdf
+
+def render_variants_zip(personal_info, sections_data, variants, optimize=False):
+    """
+    Builds the variants zip (and the unmatched variant names, see
+    `build_resume_variants_zip`) on the shared pool. A pool whose worker died stays
+    broken, so it is dropped from the cache and this request renders in-thread;
+    the next request starts a fresh pool.
+    """
+    pool = get_render_pool()
+    try:
+        return build_resume_variants_zip(personal_info, sections_data, variants, optimize=optimize, executor=pool)
+    except BrokenProcessPool:
+        get_render_pool.clear()
+        pool.shutdown(wait=False, cancel_futures=True)
+        return build_resume_variants_zip(personal_info, sections_data, variants, optimize=optimize)
 
 
 # =============================================================================
@@ -530,6 +882,19 @@ def render_header():
                     unsafe_allow_html=True)
 
 
+def render_field_feedback(field_key, container=st):
+    """Shows the rule violations (red) and warnings (amber) of one field right under its widget."""
+    if not st.session_state.get(field_key):
+        return  # Missing required fields are reported on generate, not while typing
+    errors, warnings = validate_fields([field_key])[field_key]
+    for msg, color, icon in [(e, "#FCA5A5", "⚠️") for e in errors] + [(w, "#FCD34D", "ℹ️") for w in warnings]:
+        container.markdown(f"""
+        <div style="color: {color} !important; font-size: 12px; margin-top: -10px; margin-bottom: 8px;">
+            {icon} {msg}
+        </div>
+        """, unsafe_allow_html=True)
+
+
 @st.dialog("⚠️ Resume Validation")
 def show_error_modal(errors):
     """Displays a professional modal dialog for validation errors."""
@@ -553,7 +918,7 @@ def show_error_modal(errors):
         st.rerun()
 
 
-def render_section_manager(key, title, ph_t="", ph_c="", ph_d="", ph_desc=""):
+def render_section_manager(key, title, ph_t="", ph_c="", ph_d="", ph_desc="", ph_tags=""):
     """
     Generic function to render Add/Edit/List UI for any section.
     Includes placeholders logic and edit mode handling.
@@ -566,37 +931,59 @@ def render_section_manager(key, title, ph_t="", ph_c="", ph_d="", ph_desc=""):
 
         # Keys for widgets
         k1, k2, k3, k4 = f"t_{key}", f"c_{key}", f"d_{key}", f"desc_{key}"
+        k5 = f"g_{key}"
 
         # --- INPUT FORM ---
         # Layout depends on section type
         if key == 'experience':
             c1, c2, c3 = st.columns([2, 2, 1])
             c1.text_input("Job Title", key=k1, placeholder=ph_t)
+            render_field_feedback(k1, c1)
             c2.text_input("Company", key=k2, placeholder=ph_c)
+            render_field_feedback(k2, c2)
             c3.text_input("Date", key=k3, placeholder=ph_d)
+            render_field_feedback(k3, c3)
             st.text_area("Description (Bullet Points)", key=k4, height=120, placeholder=ph_desc,
-                         help="Use bullet points for better ATS parsing.")
+                         help="Use bullet points for better ATS parsing. End a bullet with #tags "
+                              "(e.g. #backend #python) to tailor it; those trailing tags are not printed.")
+            render_field_feedback(k4)
+            st.text_input("Tags", key=k5, placeholder=ph_tags,
+                          help="Comma separated. Used to select this item for tailored variants.")
+            render_field_feedback(k5)
 
         elif key == 'education':
             c1, c2, c3 = st.columns([2, 2, 1])
             c1.text_input("Degree", key=k1, placeholder=ph_t)
+            render_field_feedback(k1, c1)
             c2.text_input("Institution", key=k2, placeholder=ph_c)
+            render_field_feedback(k2, c2)
             c3.text_input("Date", key=k3, placeholder=ph_d)
+            render_field_feedback(k3, c3)
 
         elif key == 'projects':
             c1, c2 = st.columns([3, 1])
             c1.text_input("Project Name", key=k1, placeholder=ph_t)
+            render_field_feedback(k1, c1)
             c2.text_input("Date", key=k3, placeholder=ph_d)
+            render_field_feedback(k3, c2)
             st.text_area("Description (Bullet Points)", key=k4, height=120, placeholder=ph_desc)
+            render_field_feedback(k4)
+            st.text_input("Tags", key=k5, placeholder=ph_tags,
+                          help="Comma separated. Used to select this item for tailored variants.")
+            render_field_feedback(k5)
 
         elif key == 'certs':
             c1, c2, c3 = st.columns([2, 2, 1])
             c1.text_input("Certification Name", key=k1, placeholder=ph_t)
+            render_field_feedback(k1, c1)
             c2.text_input("Issuing Authority", key=k2, placeholder=ph_c)
+            render_field_feedback(k2, c2)
             c3.text_input("Date", key=k3, placeholder=ph_d)
+            render_field_feedback(k3, c3)
 
         else:  # Skills & Languages
             st.text_input("Item Name", key=k1, placeholder=ph_t)
+            render_field_feedback(k1)
 
         # --- ACTION BUTTONS ---
         btn_col1, btn_col2, _ = st.columns([1, 1, 6])
@@ -607,7 +994,7 @@ def render_section_manager(key, title, ph_t="", ph_c="", ph_d="", ph_desc=""):
             btn_col1.button("Save Changes", key=f"save_{key}", type="primary",
                             on_click=save_changes_callback, args=(key, idx))
             # Cancel Button
-            btn_col2.button("Cancel", key=f"cancel_{key}", kind="secondary",
+            btn_col2.button("Cancel", key=f"cancel_{key}", type="secondary",
                             on_click=cancel_edit_callback, args=(key,))
         else:
             # Add Button
@@ -622,6 +1009,7 @@ def render_section_manager(key, title, ph_t="", ph_c="", ph_d="", ph_desc=""):
                 main_txt = item.get('title') or item.get('degree') or item.get('name') or item.get('text')
                 sub_txt = item.get('company') or item.get('school') or item.get('authority')
                 date_txt = item.get('date')
+                tags_txt = ", ".join(item.get('tags', []))
 
                 # HTML Construction for beautiful list items
                 html_block = f"""
@@ -630,6 +1018,7 @@ def render_section_manager(key, title, ph_t="", ph_c="", ph_d="", ph_desc=""):
                         <span style="color: #F8FAFC; font-weight: 600; font-size: 15px;">{i + 1}. {main_txt}</span>
                         {f'<span style="color: #94A3B8; font-size: 13px; margin-left: 10px;">| {sub_txt}</span>' if sub_txt else ''}
                         {f'<span style="color: #64748B; font-size: 12px; margin-left: 10px;">({date_txt})</span>' if date_txt else ''}
+                        {f'<span style="color: #818CF8; font-size: 12px; margin-left: 10px;">#{tags_txt}</span>' if tags_txt else ''}
                     </div>
                 </div>
                 """
@@ -643,33 +1032,97 @@ def render_section_manager(key, title, ph_t="", ph_c="", ph_d="", ph_desc=""):
                 r3.button("🗑️", key=f"del_{key}_{i}", help="Delete Item",
                           on_click=delete_item_callback, args=(key, i))
 
+            # Saved-item checks (date formats & ordering)
+            item_errors, item_warnings = validate_section_items(key)
+            for msg in item_errors:
+                st.error(msg, icon="⚠️")
+            for msg in item_warnings:
+                st.caption(f"ℹ️ {msg}")
+
 
 # =============================================================================
 # 8. MAIN APPLICATION LAYOUT
 # =============================================================================
 
+def collect_resume_errors():
+    """Runs every validation rule before generation and returns a list of error messages."""
+    errors = [err for errs, _warnings in validate_fields(PERSONAL_FIELDS).values() for err in errs]
+    for key in SECTIONS:
+        errors.extend(validate_section_items(key)[0])
+
+    # Check for at least one core section
+    if not st.session_state.experience and not st.session_state.education:
+        errors.append("Resume looks empty! Please add Experience or Education.")
+
+    return errors
+
+
+def memory_monitor_enabled() -> bool:
+    """
+    The operator panel is shown only for ?monitor=<token> matching the
+    `memory_monitor_token` secret (.streamlit/secrets.toml); without it the panel is off.
+    """
+    try:
+        token = st.secrets.get("memory_monitor_token")
+    except FileNotFoundError:  # No secrets configured
+        return False
+    given = st.query_params.get("monitor", "")
+    # Compared as bytes: compare_digest rejects non-ASCII str
+    return bool(token) and hmac.compare_digest(str(token).encode(), given.encode())
+
+
+def render_memory_monitor():
+    """Session memory panel for operators (see `memory_monitor_enabled`)."""
+    stats = get_memory_governor().stats()
+    with st.expander("📊 Session Memory Monitor", expanded=True):
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Sessions", len(stats['sessions']))
+        m2.metric("Total State", f"{stats['total_bytes'] / 1024:.1f} KB")
+        m3.metric("Ceiling", f"{stats['ceiling_bytes'] / 1024 ** 2:.0f} MB")
+        m4.metric("Compacted / Evicted", f"{stats['counts']['compacted']} / {stats['counts']['evicted']}")
+        st.dataframe(stats['sessions'], use_container_width=True, hide_index=True)
+
+
 def main():
+    restore_session_state()
+    try:
+        render_app()
+    finally:
+        release_session_state()
+
+
+def render_app():
     render_header()
 
+    if memory_monitor_enabled():
+        render_memory_monitor()
+
     st.markdown("<br>", unsafe_allow_html=True)
 
     # --- IDENTITY SECTION ---
     with st.container():
         st.subheader("👤 Personal Information")
         c1, c2, c3 = st.columns(3)
-        name = c1.text_input("Full Name", placeholder="e.g. Name")
-        email = c2.text_input("Email", placeholder="e.g. Email@example.com")
-        phone = c3.text_input("Phone", placeholder="e.g. +20 123 456 7890")
+        name = c1.text_input("Full Name", key="p_name", placeholder="e.g. Name")
+        render_field_feedback("p_name", c1)
+        email = c2.text_input("Email", key="p_email", placeholder="e.g. Email@example.com")
+        render_field_feedback("p_email", c2)
+        phone = c3.text_input("Phone", key="p_phone", placeholder="e.g. +20 123 456 7890")
+        render_field_feedback("p_phone", c3)
 
         c4, c5, c6 = st.columns(3)
-        loc = c4.text_input("Location", placeholder="City, Country")
-        linkedin = c5.text_input("LinkedIn URL", placeholder="linkedin.com/in/...")
-        github = c6.text_input("GitHub URL", placeholder="github.com/...")
+        loc = c4.text_input("Location", key="p_location", placeholder="City, Country")
+        render_field_feedback("p_location", c4)
+        linkedin = c5.text_input("LinkedIn URL", key="p_linkedin", placeholder="linkedin.com/in/...")
+        render_field_feedback("p_linkedin", c5)
+        github = c6.text_input("GitHub URL", key="p_github", placeholder="github.com/...")
+        render_field_feedback("p_github", c6)
 
         st.markdown("<br>", unsafe_allow_html=True)
-        summary = st.text_area("Professional Summary", height=100,
+        summary = st.text_area("Professional Summary", key="p_summary", height=100,
                                placeholder="Briefly describe your experience, key skills, and career goals...",
                                help="Keep it between 2-4 sentences for best ATS results.")
+        render_field_feedback("p_summary")
 
         # Summary Character Count
         st.caption(f"Characters: {len(summary)} / {MAX_SUMMARY_CHARS}")
@@ -683,12 +1136,14 @@ def main():
                            ph_t="Job Title (e.g. Backend Developer)",
                            ph_c="Company Name",
                            ph_d="Jan 2023 - Present",
-                           ph_desc="• Achieved [X]% improvement in...\n• Led the development of...")
+                           ph_desc="• Achieved [X]% improvement in...\n• Led the development of...",
+                           ph_tags="e.g. backend, python, leadership")
 
     render_section_manager('projects', 'Technical Projects',
                            ph_t="Project Name",
                            ph_d="2024",
-                           ph_desc="• Built using Python, Streamlit...\n• Solved [Problem] by implementing [Solution]...")
+                           ph_desc="• Built using Python, Streamlit...\n• Solved [Problem] by implementing [Solution]...",
+                           ph_tags="e.g. data, frontend")
 
     render_section_manager('education', 'Education',
                            ph_t="Degree (e.g. B.Sc. Computer Science)",
@@ -708,65 +1163,88 @@ def main():
 
     st.divider()
 
+    # --- TAILORED VARIANTS ---
+    with st.container():
+        st.subheader("🎯 Tailored Variants")
+        variants_raw = st.text_area(
+            "Target Roles", key="variants_raw", height=150,
+            placeholder="Backend Engineer\npython, backend, api\n---\nData Analyst\n<paste the job description here>",
+            help="One block per variant, separated by a line with ---. First line is the variant name, "
+                 "the rest is a tag list or a job description matched against your item tags.")
+
+    # Package Data
+    personal_data = {
+        'name': name, 'email': email, 'phone': phone,
+        'location': loc, 'linkedin': linkedin, 'github': github,
+        'summary': summary
+    }
+    sections_data = {k: st.session_state[k] for k in SECTIONS}
+
     # --- GENERATION LOGIC ---
     col_gen_1, col_gen_2, col_gen_3 = st.columns([1, 2, 1])
 
     with col_gen_2:
+        compact_pdf = st.checkbox("⚡ Compact PDF (smaller files for sharing & storage)", key="compact_pdf")
+
         if st.button("🚀 GENERATE FINAL PDF RESUME", type="primary", use_container_width=True):
 
             # 1. Validation Phase
-            errors = []
-            if not name.strip(): errors.append("Full Name is missing.")
-            if not email.strip():
-                errors.append("Email is missing.")
-            elif not validate_email(email):
-                errors.append("Email format is invalid.")
-
-            # Check for at least one core section
-            if not st.session_state.experience and not st.session_state.education:
-                errors.append("Resume looks empty! Please add Experience or Education.")
+            errors = collect_resume_errors()
 
             # 2. Execution Phase
             if errors:
                 show_error_modal(errors)
             else:
                 try:
-                    # Package Data
-                    personal_data = {
-                        'name': name, 'email': email, 'phone': phone,
-                        'location': loc, 'linkedin': linkedin, 'github': github,
-                        'summary': summary
-                    }
-
-                    sections_data = {k: st.session_state[k] for k in SECTIONS}
+                    # Generate PDF (serialized in memory)
+                    pdf = build_pdf_resume(personal_data, sections_data, optimize=compact_pdf)
+                    pdf_data = pdf_to_bytes(pdf)
 
-                    # Generate PDF
-                    pdf = build_pdf_resume(personal_data, sections_data)
+                    st.balloons()  # Success Effect
+                    st.toast("Resume Generated Successfully! Ready to Download.", icon="🎉")
 
-                    # Handle File Output
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                        pdf.output(tmp_file.name)
+                    st.download_button(
+                        label="📥 CLICK TO DOWNLOAD PDF",
+                        data=pdf_data,
+                        file_name=f"{name.replace(' ', '_')}_Resume.pdf",
+                        mime="application/pdf",
+                        type="primary"  # Prominent download button
+                    )
 
-                        with open(tmp_file.name, "rb") as f:
-                            pdf_data = f.read()
-
-                            st.balloons()  # Success Effect
-                            st.toast("Resume Generated Successfully! Ready to Download.", icon="🎉")
+                except Exception as e:
+                    st.error(f"Critical System Error: {str(e)}")
+                    # In production, you would log this error to a file/service
 
-                            st.download_button(
-                                label="📥 CLICK TO DOWNLOAD PDF",
-                                data=pdf_data,
-                                file_name=f"{name.replace(' ', '_')}_Resume.pdf",
-                                mime="application/pdf",
-                                type="primary"  # Prominent download button
-                            )
+        if st.button("📦 GENERATE TAILORED VARIANTS (ZIP)", type="secondary", use_container_width=True):
+            errors = collect_resume_errors()
+            variants = parse_variant_specs(variants_raw)
+            if not variants:
+                errors.append("Add at least one target role to generate tailored variants.")
 
-                    # Cleanup
-                    os.unlink(tmp_file.name)
+            if errors:
+                show_error_modal(errors)
+            else:
+                try:
+                    zip_stream, unmatched = render_variants_zip(personal_data, sections_data, variants,
+                                                                optimize=compact_pdf)
+                    st.toast(f"{len(variants)} Tailored Resumes Generated!", icon="🎉")
+                    if unmatched:
+                        st.warning(
+                            f"Not tailored (no profile tag matched the target): {', '.join(unmatched)}. "
+                            "Those PDFs contain your full resume; tag items and bullets "
+                            "(e.g. #backend) to tailor them."
+                        )
+
+                    st.download_button(
+                        label="📥 DOWNLOAD ALL VARIANTS (ZIP)",
+                        data=zip_stream,
+                        file_name=f"{name.replace(' ', '_')}_Resumes.zip",
+                        mime="application/zip",
+                        type="primary"
+                    )
 
                 except Exception as e:
                     st.error(f"Critical System Error: {str(e)}")
-                    # In production, you would log this error to a file/service
 
 
 if __name__ == "__main__":
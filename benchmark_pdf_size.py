@@ -0,0 +1,181 @@
+"""
+PDF size / latency benchmark: standard vs. optimized ("Compact PDF") output.
+
+Every optimized file is re-read through its own cross-reference stream and
+object stream and must give the same page count and page text as the
+standard file; the benchmark fails otherwise.
+
+Usage:
+    python benchmark_pdf_size.py [repeats]
+"""
+
+import re
+import sys
+import statistics
+import time
+import zlib
+
+from pdf_engine import build_pdf_resume, pdf_to_bytes
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+PERSONAL = {
+    'name': 'Jane Doe', 'email': 'jane.doe@example.com', 'phone': '+20 123 456 7890',
+    'location': 'Cairo, Egypt', 'linkedin': 'linkedin.com/in/jane-doe', 'github': 'github.com/janedoe',
+    'summary': ("Backend engineer with 6 years of experience building payment and data platforms. "
+                "Focused on reliability, observability and developer experience."),
+}
+
+
+def make_sections(jobs, projects, bullets):
+    return {
+        'experience': [{'title': f'Software Engineer {i}', 'company': f'Company {i}', 'date': 'Jan 2020 - Present',
+                        'desc': "\n".join(f"• Improved service {j} latency by {10 + j}% using caching and batching"
+                                          for j in range(bullets)),
+                        'tags': []} for i in range(jobs)],
+        'projects': [{'title': f'Project {i}', 'date': '2024',
+                      'desc': "\n".join(f"• Built feature {j} with Python, Streamlit and PostgreSQL"
+                                        for j in range(bullets)),
+                      'tags': []} for i in range(projects)],
+        'education': [{'degree': 'B.Sc. Computer Science', 'school': 'Cairo University', 'date': '2014 - 2018'}],
+        'certs': [{'name': 'AWS Solutions Architect', 'authority': 'Amazon', 'date': '2022'}],
+        'skills': [{'text': s} for s in ['Python', 'SQL', 'Docker', 'AWS', 'Kubernetes']],
+        'languages': [{'text': 'English: Fluent'}, {'text': 'Arabic: Native'}],
+    }
+
+
+FIXTURES = {
+    'minimal': make_sections(jobs=1, projects=1, bullets=2),
+    'typical': make_sections(jobs=3, projects=2, bullets=4),
+    'large': make_sections(jobs=8, projects=6, bullets=6),
+}
+
+
+# =============================================================================
+# READ-BACK CHECK
+# =============================================================================
+# A small independent reader for the two layouts written here: a classic xref
+# table (FPDF) or a cross-reference stream plus one object stream (optimizer).
+
+_OBJ_AT = re.compile(rb"\s*(\d+)\s+0\s+obj\s*")
+_STRING = re.compile(rb"\((?:\\.|[^\\)])*\)", re.DOTALL)
+
+
+def _dict_end(data, pos):
+    depth = 0
+    while True:
+        string = _STRING.match(data, pos)
+        if string:
+            pos = string.end()
+        elif data.startswith(b"<<", pos):
+            depth, pos = depth + 1, pos + 2
+        elif data.startswith(b">>", pos):
+            depth, pos = depth - 1, pos + 2
+            if depth == 0:
+                return pos
+        else:
+            pos += 1
+
+
+def _object_at(data, offset):
+    """Returns (dict_bytes, stream_bytes or None) of the object at `offset`."""
+    start = _OBJ_AT.match(data, offset).end()
+    if not data.startswith(b"<<", start):
+        return data[start:data.index(b"endobj", start)].strip(), None
+    end = _dict_end(data, start)
+    body = data[start:end]
+    stream = re.match(rb"\s*stream\r?\n", data[end:end + 10])
+    if not stream:
+        return body, None
+    length = int(re.search(rb"/Length (\d+)", body).group(1))
+    return body, data[end + stream.end():end + stream.end() + length]
+
+
+def _decode(body, stream):
+    return zlib.decompress(stream) if b"/FlateDecode" in body else stream
+
+
+def _ref(body, key):
+    return int(re.search(rb"/" + key + rb"\s+(\d+) 0 R", body).group(1))
+
+
+def read_pdf_text(data):
+    """Returns (page_count, [text of each page]) by following the file's xref."""
+    xref_at = int(re.search(rb"startxref\s+(\d+)\s+%%EOF\s*$", data).group(1))
+    objects = {}
+    if data.startswith(b"xref", xref_at):
+        trailer_at = data.index(b"trailer", xref_at)
+        rows = re.findall(rb"(\d{10}) \d{5} n", data[xref_at:trailer_at])
+        first = int(data[xref_at + 4:trailer_at].split()[0])
+        for num, offset in enumerate(rows, start=first + 1):
+            objects[num] = _object_at(data, int(offset))
+        trailer = data[trailer_at:]
+    else:
+        trailer, rows = _object_at(data, xref_at)
+        widths = [int(w) for w in re.search(rb"/W \[(\d+) (\d+) (\d+)\]", trailer).groups()]
+        rows, size = _decode(trailer, rows), sum(widths)
+        packed = {}
+        for num in range(len(rows) // size):
+            row, fields, pos = rows[num * size:(num + 1) * size], [], 0
+            for width in widths:
+                fields.append(int.from_bytes(row[pos:pos + width], "big"))
+                pos += width
+            if fields[0] == 1:
+                objects[num] = _object_at(data, fields[1])
+            elif fields[0] == 2:
+                packed[num] = (fields[1], fields[2])
+        for num, (container, index) in packed.items():
+            body, stream = objects[container]
+            content = _decode(body, stream)
+            first = int(re.search(rb"/First (\d+)", body).group(1))
+            header = [int(v) for v in content[:first].split()]
+            offsets = header[1::2] + [len(content) - first]
+            objects[num] = (content[first + offsets[index]:first + offsets[index + 1]].strip(), None)
+
+    pages = objects[_ref(objects[_ref(trailer, b"Root")][0], b"Pages")][0]
+    count = int(re.search(rb"/Count (\d+)", pages).group(1))
+    texts = []
+    for kid in re.findall(rb"(\d+) 0 R", re.search(rb"/Kids \[(.*?)\]", pages).group(1)):
+        content = _decode(*objects[_ref(objects[int(kid)][0], b"Contents")])
+        texts.append(b"".join(m[1:-1] for m in re.findall(rb"(\((?:\\.|[^\\)])*\)) Tj", content)))
+    return count, texts
+
+
+def check_optimized(standard, optimized, name):
+    expected, actual = read_pdf_text(standard), read_pdf_text(optimized)
+    assert actual[0] == expected[0], f"{name}: {actual[0]} pages after optimizing, expected {expected[0]}"
+    assert actual[1] == expected[1], f"{name}: page text changed by the optimizer"
+    assert expected[0] == len(expected[1]) and any(expected[1]), f"{name}: reader found no pages/text"
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def measure(sections, optimize, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        data = pdf_to_bytes(build_pdf_resume(PERSONAL, sections, optimize=optimize))
+        timings.append((time.perf_counter() - start) * 1000)
+    return data, statistics.median(timings)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"{'fixture':<10}{'standard':>12}{'optimized':>12}{'saved':>8}{'std ms':>10}{'opt ms':>10}{'pages':>7}")
+    for name, sections in FIXTURES.items():
+        standard, std_ms = measure(sections, False, repeats)
+        optimized, opt_ms = measure(sections, True, repeats)
+        check_optimized(standard, optimized, name)
+        std_size, opt_size = len(standard), len(optimized)
+        saved = 100 * (1 - opt_size / std_size)
+        print(f"{name:<10}{std_size:>10} B{opt_size:>10} B{saved:>7.1f}%{std_ms:>10.2f}{opt_ms:>10.2f}"
+              f"{read_pdf_text(optimized)[0]:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Tailored-variant benchmark: one variants zip vs. N separate PDF builds.
+
+Compares, for N variants of the same profile:
+  - separate:  N single-variant build_resume_variants_zip() calls, i.e. the
+               profile is prepared, tailored and rendered again per variant
+  - zip:       build_resume_variants_zip() rendering in this process
+  - zip+pool:  build_resume_variants_zip() on a warm process pool
+
+Usage:
+    python benchmark_variants.py [variants] [repeats] [workers]
+"""
+
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark_pdf_size import PERSONAL, make_sections
+from pdf_engine import build_resume_variants_zip
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+TAGS = ['backend', 'frontend', 'data', 'cloud', 'python', 'sql']
+
+
+def tagged_sections(jobs=4, projects=4, bullets=5):
+    """A 'typical' profile where items and bullets carry tailoring tags."""
+    sections = make_sections(jobs, projects, bullets)
+    for key in ('experience', 'projects'):
+        for i, item in enumerate(sections[key]):
+            item['tags'] = [TAGS[i % len(TAGS)]]
+            lines = item['desc'].split('\n')
+            item['desc'] = "\n".join(f"{line} #{TAGS[(i + j) % len(TAGS)]}" for j, line in enumerate(lines))
+    return sections
+
+
+def make_variants(count):
+    return [{'name': f"Variant {i}", 'target': f"{TAGS[i % len(TAGS)]}, {TAGS[(i + 1) % len(TAGS)]}"}
+            for i in range(count)]
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def median_ms(action, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else min(4, os.cpu_count() or 1)
+
+    sections = tagged_sections()
+    variants = make_variants(count)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        build_resume_variants_zip(PERSONAL, sections, variants, executor=pool)  # Start the workers
+
+        print(f"{count} variants, {workers} workers, median of {repeats} runs")
+        print(f"{'mode':<12}{'standard ms':>14}{'optimized ms':>14}")
+        for label, action in [
+            ('separate', lambda opt: [build_resume_variants_zip(PERSONAL, sections, [variant], optimize=opt)
+                                      for variant in variants]),
+            ('zip', lambda opt: build_resume_variants_zip(PERSONAL, sections, variants, optimize=opt)),
+            ('zip+pool', lambda opt: build_resume_variants_zip(PERSONAL, sections, variants, optimize=opt,
+                                                               executor=pool)),
+        ]:
+            std_ms = median_ms(lambda: action(False), repeats)
+            opt_ms = median_ms(lambda: action(True), repeats)
+            print(f"{label:<12}{std_ms:>14.1f}{opt_ms:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
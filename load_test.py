@@ -0,0 +1,342 @@
+"""
+Load-testing harness: simulates concurrent Streamlit sessions end to end.
+
+Each simulated user drives ATS_website.py through Streamlit's script-runner
+test API (no browser, no network): fill personal info, add N items per
+section (add_item_callback), edit one item, delete one item, then generate
+the PDF. Sessions run concurrently on a thread pool, each with its own
+session id, so the app's session memory governor tracks every one of them.
+
+Usage:
+    python load_test.py --sessions 20 --concurrency 8 --items 3
+
+Reports per-interaction latency percentiles, the memory of one session
+measured alone (tracemalloc), the governor's per-session view, process
+RSS and completed sessions per second.
+"""
+
+import argparse
+import contextlib
+import gc
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+import warnings
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import streamlit
+from streamlit import config as st_config
+from streamlit.runtime import Runtime
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+# The patches below rely on Streamlit internals (Runtime._instance,
+# LocalScriptRunner._session_id) as of this version.
+TESTED_STREAMLIT = "1.66"
+
+
+def _share_test_runtime():
+    """
+    AppTest installs a mock Runtime singleton for each run and clears it when
+    the run ends, which breaks runs still in progress on other threads. Keep
+    serving the most recent mock to those runs, like the single Runtime of a
+    real server process.
+    """
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last['runtime'] = cls._instance
+            return cls._instance
+        if 'runtime' in last:
+            return last['runtime']
+        raise RuntimeError("Runtime hasn't been created!")
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or 'runtime' in last)
+
+
+_session_ids = threading.local()
+
+
+def _distinct_session_ids():
+    """
+    AppTest gives every script run the session id "test session id", so the
+    app's memory governor would see all simulated users as a single session.
+    Each run uses the id of the simulated session driving it (set per thread).
+    """
+    init = LocalScriptRunner.__init__
+
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        self._session_id = getattr(_session_ids, 'current', self._session_id)
+
+    LocalScriptRunner.__init__ = __init__
+
+
+@contextlib.contextmanager
+def concurrent_app_tests():
+    """
+    Patches Streamlit's test client so that many AppTest sessions can run at
+    once on threads, each under its own session id; undone on exit.
+    """
+    if not streamlit.__version__.startswith(TESTED_STREAMLIT + "."):
+        warnings.warn(f"load_test.py patches Streamlit {TESTED_STREAMLIT} internals; "
+                      f"Streamlit {streamlit.__version__} is installed, results may be wrong")
+    saved = {name: Runtime.__dict__[name] for name in ('instance', 'exists')}
+    saved_init = LocalScriptRunner.__init__
+    saved_magic = st_config.get_option("runner.magicEnabled")
+    # The app does not rely on "magic" writes, and magic's ast.parse is not safe
+    # to call from many threads at once on some CPython versions.
+    st_config.set_option("runner.magicEnabled", False)
+    _share_test_runtime()
+    _distinct_session_ids()
+    try:
+        yield
+    finally:
+        for name, attribute in saved.items():
+            setattr(Runtime, name, attribute)
+        LocalScriptRunner.__init__ = saved_init
+        st_config.set_option("runner.magicEnabled", saved_magic)
+
+
+MONITOR_TOKEN = "load-test"  # Served to the app as its memory_monitor_token secret
+APP_PATH = str(Path(__file__).with_name("ATS_website.py"))
+SCRIPT_TIMEOUT = 60  # seconds per rerun
+
+SECTIONS = ['experience', 'projects', 'education', 'certs', 'skills', 'languages']
+GENERATE_LABEL = "🚀 GENERATE FINAL PDF RESUME"
+
+WORDS = ("built led designed shipped migrated automated scaled reduced improved api pipeline service "
+         "dashboard cluster cache queue python sql docker aws kafka latency cost reliability team").split()
+
+
+# =============================================================================
+# SIMULATED USER
+# =============================================================================
+
+def sentence(rng, words=8):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def section_inputs(section, rng):
+    """Widget values for one new item of `section` (keys as in render_section_manager)."""
+    year = rng.randint(2010, 2020)
+    values = {f"t_{section}": sentence(rng, 3)}
+    if section in ('experience', 'education', 'certs'):
+        values[f"c_{section}"] = sentence(rng, 2)
+    if section in ('experience', 'projects', 'education', 'certs'):
+        values[f"d_{section}"] = f"Jan {year} - Dec {year + 2}"
+    if section in ('experience', 'projects'):
+        values[f"desc_{section}"] = "\n".join(f"• {sentence(rng)}" for _ in range(rng.randint(2, 5)))
+    return values
+
+
+def find_input(at, key):
+    for widget in (at.text_input, at.text_area):
+        try:
+            return widget(key=key)
+        except KeyError:
+            continue
+    raise KeyError(key)
+
+
+class SimulatedSession:
+    """One user tab, driven through AppTest; records latency per interaction."""
+
+    def __init__(self, session_id, items_per_section, seed):
+        self.name = f"sim{session_id:05d}"  # 8 characters: the monitor shows session ids truncated to 8
+        self.rng = random.Random(seed + session_id)
+        self.items = items_per_section
+        self.latencies = defaultdict(list)
+        self.at = None
+
+    def step(self, interaction, action):
+        start = time.perf_counter()
+        action().run(timeout=SCRIPT_TIMEOUT)
+        self.latencies[interaction].append(time.perf_counter() - start)
+        if self.at.exception:
+            raise RuntimeError(f"{interaction}: {self.at.exception[0].message}")
+
+    def run(self):
+        _session_ids.current = self.name
+        self.at = AppTest.from_file(APP_PATH, default_timeout=SCRIPT_TIMEOUT)
+        self.step('load', lambda: self.at)
+
+        # 1. Personal information
+        personal = {
+            'p_name': f"User {self.rng.randint(1, 10 ** 6)}",
+            'p_email': f"user{self.rng.randint(1, 10 ** 6)}@example.com",
+            'p_phone': "+20 123 456 7890",
+            'p_location': "Cairo, Egypt",
+            'p_linkedin': "linkedin.com/in/load-test",
+            'p_github': "github.com/load-test",
+            'p_summary': sentence(self.rng, 40),
+        }
+        for key, value in personal.items():
+            self.step('fill_personal', lambda: find_input(self.at, key).input(value))
+
+        # 2. Add N items per section (each add = fill inputs + add_item_callback rerun)
+        for section in SECTIONS:
+            for _ in range(self.items):
+                for key, value in section_inputs(section, self.rng).items():
+                    find_input(self.at, key).set_value(value)
+                self.step('add_item', lambda: self.at.button(key=f"add_{section}").click())
+
+        # 3. Edit one item (load into inputs, change, save)
+        section = self.rng.choice(SECTIONS)
+        self.step('edit_open', lambda: self.at.button(key=f"edt_{section}_0").click())
+        find_input(self.at, f"t_{section}").set_value(sentence(self.rng, 3))
+        self.step('edit_save', lambda: self.at.button(key=f"save_{section}").click())
+
+        # 4. Delete one item
+        section = self.rng.choice(SECTIONS)
+        self.step('delete_item', lambda: self.at.button(key=f"del_{section}_{self.items - 1}").click())
+
+        # 5. Generate
+        generate = next(b for b in self.at.button if b.label == GENERATE_LABEL)
+        self.step('generate', lambda: generate.click())
+        if not self.at.get("download_button"):
+            raise RuntimeError("generate: no download button rendered")
+        return self
+
+
+# =============================================================================
+# RUNNER & REPORT
+# =============================================================================
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure_one_session(items, seed):
+    """
+    Runs one session alone under tracemalloc, after an untraced warm-up
+    session (imports, caches). Returns (bytes still allocated after its last
+    rerun with the session kept open, peak bytes during it). Both include the
+    AppTest client's own element tree, so they are an upper bound.
+    """
+    SimulatedSession(90000, items, seed).run()
+    gc.collect()
+    tracemalloc.start()
+    session = SimulatedSession(90001, items, seed).run()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del session
+    return retained, peak
+
+
+def governor_view():
+    """Reads the governor's per-session table through the app's own memory monitor."""
+    _session_ids.current = "monitor0"
+    at = AppTest.from_file(APP_PATH, default_timeout=SCRIPT_TIMEOUT)
+    at.secrets["memory_monitor_token"] = MONITOR_TOKEN
+    at.query_params["monitor"] = MONITOR_TOKEN
+    at.run()
+    if at.exception or not at.dataframe:
+        return []
+    return at.dataframe[0].value.to_dict('records')
+
+
+def run_load(sessions, concurrency, items, seed):
+    lock = threading.Lock()
+    done, failures = [], []
+
+    def worker(session_id):
+        session = SimulatedSession(session_id, items, seed)
+        try:
+            session.run()
+        except Exception as e:  # Report, keep the other sessions going
+            with lock:
+                failures.append((session_id, str(e)))
+            return
+        with lock:
+            done.append(session)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(sessions)))
+    return done, failures, time.perf_counter() - start
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def report(done, failures, wall_time, concurrency, baseline_rss_mb, one_session, governed):
+    print(f"\nSessions: {len(done)} ok, {len(failures)} failed | concurrency {concurrency} | "
+          f"wall time {wall_time:.1f}s")
+    for session_id, error in failures[:5]:
+        print(f"  ! session {session_id}: {error}")
+    if not done:
+        return
+
+    merged = defaultdict(list)
+    for session in done:
+        for interaction, samples in session.latencies.items():
+            merged[interaction].extend(samples)
+
+    print(f"\n{'interaction':<15}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for interaction, samples in merged.items():
+        ms = [s * 1000 for s in samples]
+        print(f"{interaction:<15}{len(ms):>7}{percentile(ms, 50):>10.1f}{percentile(ms, 90):>10.1f}"
+              f"{percentile(ms, 95):>10.1f}{percentile(ms, 99):>10.1f}{max(ms):>10.1f}")
+
+    retained, peak = one_session
+    print(f"\nOne session alone (tracemalloc, incl. the test client): {retained / 1024:.0f} KB retained, "
+          f"{peak / 1024:.0f} KB peak")
+
+    names = {session.name for session in done}
+    rows = [row for row in governed if row['session'] in names]
+    if rows:
+        # Sizes as the app's governor estimates them (ATS_website.estimate_size)
+        state_kb = [row['bytes'] / 1024 for row in rows]
+        statuses = {status: sum(1 for row in rows if row['status'] == status)
+                    for status in ('active', 'compacted', 'evicted')}
+        print(f"Governor: {len(rows)} of {len(done)} sessions tracked "
+              f"({', '.join(f'{n} {status}' for status, n in statuses.items())}), session state "
+              f"mean {statistics.mean(state_kb):.1f} KB, max {max(state_kb):.1f} KB, {sum(state_kb):.1f} KB in total")
+
+    peak_mb = peak_rss_mb()
+    print(f"Process peak RSS: {peak_mb:.1f} MB ({baseline_rss_mb:.1f} MB before the concurrent run). "
+          f"Not a per-session figure: sessions overlap and freed memory is reused.")
+
+    print(f"Completed sessions: {len(done) / wall_time:.2f}/s at concurrency {concurrency} "
+          f"(each is a full flow ending in one PDF generation)")
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=positive_int, default=20, help="Total simulated sessions")
+    parser.add_argument("--concurrency", type=positive_int, default=8, help="Sessions running at the same time")
+    parser.add_argument("--items", type=positive_int, default=3, help="Items added per section")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for generated content")
+    args = parser.parse_args()
+
+    with concurrent_app_tests():
+        one_session = measure_one_session(args.items, args.seed)
+        baseline_rss_mb = peak_rss_mb()
+        done, failures, wall_time = run_load(args.sessions, args.concurrency, args.items, args.seed)
+        governed = governor_view()
+    report(done, failures, wall_time, args.concurrency, baseline_rss_mb, one_session, governed)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
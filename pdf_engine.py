@@ -0,0 +1,679 @@
+"""
+PDF engine of the resume builder: text preparation, the ATS PDF layout, the
+optimized (compact) output writer and tailored variant selection.
+
+It does not import Streamlit, so worker processes and the benchmark scripts
+can use it without running the app.
+"""
+
+import io
+import re
+import struct
+import zipfile
+import zlib
+
+from fpdf import FPDF
+
+# =============================================================================
+# 1. CONSTANTS
+# =============================================================================
+
+SECTIONS = ['experience', 'projects', 'education', 'certs', 'skills', 'languages']
+TAGGED_SECTIONS = ['experience', 'projects']  # Sections that support tailoring tags
+RELEVANCE_ORDERED_SECTIONS = ['projects']  # Tailored variants list these by relevance, not chronology
+
+
+# =============================================================================
+# 2. TEXT PREPARATION
+# =============================================================================
+
+
+def clean_text(text: str) -> str:
+    """
+    Sanitizes text to ensure PDF compatibility (Latin-1 encoding).
+    Replaces smart quotes, dashes, and other non-standard chars.
+    """
+    if not text:
+        return ""
+
+    replacements = {
+        '–': '-', '—': '-',
+        '“': '"', '”': '"',
+        '’': "'", '‘': "'",
+        '…': '...',
+        '•': '-'  # Bullets handled manually in PDF engine
+    }
+
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+
+    # Final safety encoding
+    return text.encode('latin-1', 'replace').decode('latin-1')
+
+
+# Tailoring tags end a bullet, e.g. "• Built the billing API #backend #python."
+# Tag names may contain inner dots ("#node.js") but never end with punctuation;
+# hashtags elsewhere in the line are ordinary text.
+_TAG = r"#([A-Za-z][\w+-]*(?:\.[\w+-]+)*)"
+BULLET_TAG_PATTERN = re.compile(_TAG)
+TRAILING_TAGS_PATTERN = re.compile(rf"(?:^|\s)({_TAG}(?:[\s,]+{_TAG})*)[.,;:!?]*\s*$")
+
+
+def split_bullets(description: str) -> list:
+    """
+    Splits a description into cleaned bullet lines.
+    Returns a list of (text, tags) tuples; the trailing #tags are removed from the text.
+    """
+    bullets = []
+    for line in (description or "").strip().split('\n'):
+        if not line.strip():
+            continue
+        tags = set()
+        trailing = TRAILING_TAGS_PATTERN.search(line)
+        if trailing:
+            tags = {t.lower() for t in BULLET_TAG_PATTERN.findall(trailing.group(1))}
+            line = line[:trailing.start()]
+        clean_line = re.sub(r"\s+", " ", line.replace('-', '').replace('•', '')).strip()
+        if clean_line:
+            bullets.append((clean_text(clean_line), tags))
+    return bullets
+
+
+def prepare_resume_content(personal_info, sections_data):
+    """
+    Normalizes the whole profile once (cleaned strings, split bullets, tag sets)
+    so that any number of PDF renders can share the result.
+    """
+    personal = {k: clean_text(v or "") for k, v in personal_info.items()}
+
+    sections = {}
+    for key in SECTIONS:
+        items = []
+        for item in sections_data.get(key, []):
+            prepared = {f: clean_text(v) for f, v in item.items() if isinstance(v, str) and f != 'desc'}
+            prepared['tags'] = set(item.get('tags', []))
+            if 'desc' in item:
+                prepared['desc'] = split_bullets(item['desc'])
+            items.append(prepared)
+        sections[key] = items
+
+    return {'personal': personal, 'sections': sections}
+
+
+# =============================================================================
+# 3. ATS PDF GENERATION ENGINE
+# =============================================================================
+
+class UltimateATSPDF(FPDF):
+    """
+    Custom PDF Class designed specifically for ATS Parsing.
+    - Uses Standard Fonts (Times)
+    - Linear Layout (Top to Bottom)
+    - Metadata Injection
+    - Optional optimized output (deduplicated state changes, see `optimize_pdf_bytes`)
+    """
+
+    def __init__(self, *args, optimize=False, **kwargs):
+        self.optimize = optimize
+        self._pending_font_op = None
+        self._page_state = {}
+        super().__init__(*args, **kwargs)
+
+    def _beginpage(self, orientation):
+        # Graphics state does not carry over between page content streams
+        self._pending_font_op = None
+        self._page_state = {}
+        super()._beginpage(orientation)
+
+    def _out(self, s):
+        """
+        In optimized mode, acts as a peephole filter on the page content stream:
+        font selections are deferred until something is drawn with them, and
+        stroke colour / line width operators equal to the current state are dropped.
+        """
+        if not self.optimize or self.state != 2 or not isinstance(s, str):
+            return super()._out(s)
+
+        if FONT_SELECT_OP.match(s):
+            self._pending_font_op = s
+            return
+
+        state_op = STATE_OP.match(s)
+        if state_op:
+            operator = 'w' if state_op.group(1) == 'w' else 'stroke'
+            if self._page_state.get(operator) == s:
+                return
+            self._page_state[operator] = s
+            return super()._out(s)
+
+        if self._pending_font_op and self._pending_font_op != self._page_state.get('Tf'):
+            self._page_state['Tf'] = self._pending_font_op
+            super()._out(self._pending_font_op)
+        self._pending_font_op = None
+        super()._out(s)
+
+    def set_text_color(self, r, g=-1, b=-1):
+        super().set_text_color(r, g, b)
+        if self.optimize:
+            # Text in the current fill colour needs no per-cell "q ... g ... Q" switch
+            text_op, fill_op = self.text_color.split(), self.fill_color.split()
+            self.color_flag = not (text_op[-1] == fill_op[-1] and
+                                   [float(v) for v in text_op[:-1]] == [float(v) for v in fill_op[:-1]])
+
+    def header(self):
+        # No graphical header to confuse ATS
+        pass
+
+    def footer(self):
+        # Simple footer with page number
+        self.set_y(-15)
+        self.set_font('Times', '', 9)
+        self.set_text_color(128, 128, 128)
+        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+
+    def draw_section_title(self, title):
+        """Draws a section header with a clean separator line."""
+        self.ln(6)
+        self.set_font('Times', 'B', 11)
+        self.set_text_color(0, 0, 0)  # Black
+        self.cell(0, 6, title.upper(), 0, 1, 'L')
+        self.set_draw_color(0, 0, 0)  # Black Line
+        self.line(10, self.get_y(), 200, self.get_y())
+        self.ln(2)
+
+    def draw_complex_item(self, title, subtitle, date, description, is_list=True):
+        """
+        Renders an item with Title (Left), Date (Right), Subtitle (Left), and Description.
+        This layout is optimized for parsing logic.
+        The description is either raw text or bullets already split by `split_bullets`.
+        """
+        # Line 1: Title & Date
+        self.set_font('Times', 'B', 10)
+        self.set_text_color(0, 0, 0)
+
+        # Calculate width to prevent overlapping
+        title_w = 140 if date else 190
+
+        # Draw Title
+        self.cell(title_w, 5, clean_text(title), 0, 0, 'L')
+
+        # Draw Date (Aligned Right)
+        if date:
+            self.set_font('Times', '', 10)
+            self.cell(0, 5, clean_text(date), 0, 1, 'R')
+        else:
+            self.ln(5)  # Just finish the line
+
+        # Line 2: Subtitle (Company / Institution)
+        if subtitle:
+            self.set_font('Times', 'I', 10)  # Italics for distinction
+            self.cell(0, 5, clean_text(subtitle), 0, 1, 'L')
+
+        # Line 3: Description (Bullets)
+        if description:
+            self.set_font('Times', '', 10)
+            bullets = split_bullets(description) if isinstance(description, str) else description
+            for clean_line, _tags in bullets:
+                # Manual Bullet Point Drawing for consistency
+                if is_list:
+                    current_y = self.get_y()
+                    self.set_xy(12, current_y)  # Indent
+                    self.cell(4, 5, chr(149), 0, 0)  # Bullet Char
+                    self.set_xy(16, current_y)
+                    self.multi_cell(0, 5, clean_line)
+                else:
+                    self.multi_cell(0, 5, clean_line)
+
+        self.ln(2)  # Spacing after item
+
+    def draw_simple_list(self, text):
+        """Renders simple bullet points (Skills / Languages)."""
+        self.set_font('Times', '', 10)
+        current_y = self.get_y()
+        self.set_xy(12, current_y)
+        self.cell(4, 5, chr(149), 0, 0)
+        self.set_xy(16, current_y)
+        self.multi_cell(0, 5, clean_text(text))
+
+
+def build_pdf_resume(personal_info, sections_data, optimize=False):
+    """Orchestrates the PDF creation process."""
+    return render_prepared_resume(prepare_resume_content(personal_info, sections_data), optimize=optimize)
+
+
+def render_prepared_resume(content, optimize=False):
+    """Renders a resume from the output of `prepare_resume_content`."""
+    personal_info = content['personal']
+    sections_data = content['sections']
+
+    pdf = UltimateATSPDF(orientation='P', unit='mm', format='A4', optimize=optimize)
+
+    # ATS Metadata Injection
+    pdf.set_title(f"{personal_info['name']} Resume")
+    pdf.set_author(personal_info['name'])
+    pdf.set_creator("Saif's Ultimate Resume Builder")
+    pdf.set_keywords("Resume, CV, ATS, Software Engineer, Developer")
+
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+
+    # --- 1. HEADER (Contact Info) ---
+    pdf.set_font('Times', 'B', 18)
+    pdf.cell(0, 8, personal_info['name'].upper(), 0, 1, 'C')
+
+    pdf.set_font('Times', '', 10)
+
+    # Smart joining of contact info to avoid empty pipes
+    contact_list = [
+        personal_info['location'],
+        personal_info['phone'],
+        personal_info['email']
+    ]
+    contact_string = " | ".join([c for c in contact_list if c])
+    pdf.cell(0, 5, contact_string, 0, 1, 'C')
+
+    # Links
+    links_list = [
+        personal_info['linkedin'],
+        personal_info['github']
+    ]
+    links_string = " | ".join([l for l in links_list if l])
+    if links_string:
+        pdf.cell(0, 5, links_string, 0, 1, 'C')
+
+    pdf.ln(5)
+
+    # --- 2. SUMMARY ---
+    if personal_info['summary']:
+        pdf.draw_section_title('Professional Summary')
+        pdf.set_font('Times', '', 10)
+        pdf.multi_cell(0, 5, personal_info['summary'])
+
+    # --- 3. SECTIONS ITERATION ---
+    # Defined order for best ATS results
+
+    # Skills first (High relevance)
+    if sections_data['skills']:
+        pdf.draw_section_title('Technical Skills')
+        for item in sections_data['skills']:
+            pdf.draw_simple_list(item['text'])
+
+    # Experience
+    if sections_data['experience']:
+        pdf.draw_section_title('Professional Experience')
+        for item in sections_data['experience']:
+            pdf.draw_complex_item(item['title'], item['company'], item['date'], item['desc'], is_list=True)
+
+    # Projects
+    if sections_data['projects']:
+        pdf.draw_section_title('Technical Projects')
+        for item in sections_data['projects']:
+            pdf.draw_complex_item(item['title'], None, item['date'], item['desc'], is_list=True)
+
+    # Education
+    if sections_data['education']:
+        pdf.draw_section_title('Education')
+        for item in sections_data['education']:
+            pdf.draw_complex_item(item['degree'], item['school'], item['date'], None, is_list=False)
+
+    # Certifications
+    if sections_data['certs']:
+        pdf.draw_section_title('Certifications')
+        for item in sections_data['certs']:
+            pdf.draw_complex_item(item['name'], item['authority'], item['date'], None, is_list=False)
+
+    # Languages
+    if sections_data['languages']:
+        pdf.draw_section_title('Languages')
+        for item in sections_data['languages']:
+            pdf.draw_simple_list(item['text'])
+
+    return pdf
+
+
+def pdf_to_bytes(pdf) -> bytes:
+    """Serializes an FPDF document in memory (no temp files)."""
+    data = pdf.output(dest='S')
+    if isinstance(data, str):  # PyFPDF returns a latin-1 string
+        data = data.encode('latin-1')
+    data = bytes(data)
+    if getattr(pdf, 'optimize', False):
+        data = optimize_pdf_bytes(data)
+    return data
+
+
+# =============================================================================
+# 4. OPTIMIZED PDF OUTPUT (OBJECT & CROSS-REFERENCE STREAMS)
+# =============================================================================
+# Rewrites the classic PDF 1.3 file written by FPDF into a PDF 1.5 file:
+# every stream is Flate-compressed at level 9, all other objects are packed
+# into one compressed object stream, the xref table becomes a compressed
+# cross-reference stream, and unused fonts / unreachable objects are dropped.
+
+FONT_SELECT_OP = re.compile(r"^BT /F\d+ [\d.]+ Tf ET$")
+STATE_OP = re.compile(r"^(?:[\d.]+ ){1,3}(G|RG|w)$")
+
+_OBJ_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\s*")
+_STREAM_START = re.compile(rb"\s*stream\r?\n")
+_STREAM_LENGTH = re.compile(rb"/Length\s+(\d+)\s*(?=/|>>)")
+_REF_OR_STRING = re.compile(rb"\((?:\\.|[^\\)])*\)|(\d+) 0 R", re.DOTALL)
+_CONTENTS_REFS = re.compile(rb"/Contents\s*(\[[^\]]*\]|\d+ 0 R)")
+_FONT_DICT = re.compile(rb"(/Font\s*<<)(.*?)(>>)", re.DOTALL)
+_FONT_ENTRY = re.compile(rb"/([\w.+-]+)\s+\d+ 0 R")
+_TF_OPERATOR = re.compile(rb"/([\w.+-]+)\s+[\d.]+\s+Tf")
+
+
+def _skip_dict(data, pos):
+    """Returns the index just past the dictionary starting at `pos`."""
+    depth = 0
+    while pos < len(data):
+        if data[pos:pos + 1] == b'(':  # Literal string: skip, honouring escapes
+            nesting, pos = 1, pos + 1
+            while nesting:
+                char = data[pos:pos + 1]
+                if not char:
+                    raise ValueError("Unterminated string")
+                if char == b'\\':
+                    pos += 1
+                elif char == b'(':
+                    nesting += 1
+                elif char == b')':
+                    nesting -= 1
+                pos += 1
+            continue
+        if data.startswith(b'<<', pos):
+            depth += 1
+            pos += 2
+        elif data.startswith(b'>>', pos):
+            depth -= 1
+            pos += 2
+            if depth == 0:
+                return pos
+        else:
+            pos += 1
+    raise ValueError("Unterminated dictionary")
+
+
+def _read_pdf_objects(data):
+    """
+    Parses a PDF with a classic xref table into {number: [dict_bytes, stream_bytes]}.
+    Raises ValueError for layouts this optimizer does not handle.
+    """
+    match = re.search(rb"startxref\s+(\d+)\s+%%EOF\s*$", data)
+    if not match or not data.startswith(b"xref", int(match.group(1))):
+        raise ValueError("No classic cross-reference table")
+    xref_at = int(match.group(1))
+    trailer_at = data.index(b"trailer", xref_at)
+
+    offsets = {}
+    tokens = data[xref_at + 4:trailer_at].split()
+    i = 0
+    while i < len(tokens):
+        start, count = int(tokens[i]), int(tokens[i + 1])
+        i += 2
+        for num in range(start, start + count):
+            offset, _gen, kind = tokens[i:i + 3]
+            i += 3
+            if kind == b'n':
+                offsets[num] = int(offset)
+
+    trailer = data[trailer_at:data.index(b"startxref", trailer_at)]
+    if b"/Encrypt" in trailer:
+        raise ValueError("Encrypted documents are not supported")
+    root = re.search(rb"/Root\s+(\d+) 0 R", trailer)
+    info = re.search(rb"/Info\s+(\d+) 0 R", trailer)
+    if not root:
+        raise ValueError("Missing document catalog")
+
+    objects = {}
+    for num, offset in offsets.items():
+        header = _OBJ_HEADER.match(data, offset)
+        if not header or int(header.group(1)) != num or header.group(2) != b"0":
+            raise ValueError(f"Unexpected object at offset {offset}")
+        start = header.end()
+        stream = None
+        if data.startswith(b"<<", start):
+            end = _skip_dict(data, start)
+            body = data[start:end]
+            stream_start = _STREAM_START.match(data, end)
+            if stream_start:
+                length = _STREAM_LENGTH.search(body)
+                if not length:
+                    raise ValueError(f"Object {num} has an indirect stream length")
+                stream = data[stream_start.end():stream_start.end() + int(length.group(1))]
+        else:
+            body = data[start:data.index(b"endobj", start)].strip()
+        objects[num] = [body, stream]
+
+    return objects, int(root.group(1)), int(info.group(1)) if info else None
+
+
+def _refs(body):
+    return [int(m.group(1)) for m in _REF_OR_STRING.finditer(body) if m.group(1)]
+
+
+def _decoded_stream(body, stream):
+    if b"/Filter" not in body:
+        return stream
+    if re.search(rb"/Filter\s*/FlateDecode\s*(?=/|>>)", body) and b"/DecodeParms" not in body:
+        return zlib.decompress(stream)
+    return None
+
+
+def _strip_unused_fonts(objects):
+    """Removes font resources that no page content stream selects."""
+    if any(b"/Form" in body for body, _stream in objects.values()):
+        return  # Form XObjects may use fonts too; stay conservative
+
+    used = set()
+    for body, _stream in objects.values():
+        for contents in _CONTENTS_REFS.finditer(body):
+            for num in _refs(contents.group(1)):
+                content = _decoded_stream(*objects[num])
+                if content is None:
+                    return
+                used.update(_TF_OPERATOR.findall(content))
+
+    def keep_used(match):
+        entries = [m.group(0) for m in _FONT_ENTRY.finditer(match.group(2)) if m.group(1) in used]
+        return match.group(1) + b" ".join(entries) + match.group(3)
+
+    for entry in objects.values():
+        entry[0] = _FONT_DICT.sub(keep_used, entry[0])
+
+
+def _reachable(objects, roots):
+    """Returns object numbers reachable from `roots`, in discovery order."""
+    order, seen, stack = [], set(), [r for r in reversed(roots) if r is not None]
+    while stack:
+        num = stack.pop()
+        if num in seen or num not in objects:
+            continue
+        seen.add(num)
+        order.append(num)
+        stack.extend(reversed(_refs(objects[num][0])))
+    return order
+
+
+def _compress_stream(body, stream):
+    """Flate-compresses a stream at the highest level when that makes it smaller."""
+    if b"/Filter" not in body:
+        packed = zlib.compress(stream, 9)
+        body = b"<</Filter /FlateDecode " + body[2:].lstrip()
+    else:
+        raw = _decoded_stream(body, stream)
+        if raw is None:
+            return body, stream
+        packed = zlib.compress(raw, 9)
+        if len(packed) >= len(stream):
+            return body, stream
+    return _STREAM_LENGTH.sub(b"/Length %d" % len(packed), body, count=1), packed
+
+
+def optimize_pdf_bytes(data: bytes) -> bytes:
+    """
+    Rewrites an FPDF document using object streams and a cross-reference stream.
+    Documents the optimizer cannot parse are returned unchanged.
+    """
+    try:
+        objects, root, info = _read_pdf_objects(data)
+        _strip_unused_fonts(objects)
+    except (ValueError, IndexError, KeyError, zlib.error):
+        return data
+
+    order = _reachable(objects, [root, info])
+    mapping = {old: new for new, old in enumerate(order, start=1)}
+
+    def renumber(body):
+        return _REF_OR_STRING.sub(
+            lambda m: b"%d 0 R" % mapping.get(int(m.group(1)), 0) if m.group(1) else m.group(0), body)
+
+    out = bytearray(b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n")
+    xref = {0: (0, 0, 0xFFFF)}
+    packed = []
+    for old in order:
+        num = mapping[old]
+        body, stream = objects[old]
+        body = renumber(body)
+        if stream is None:
+            packed.append((num, body))
+            continue
+        body, stream = _compress_stream(body, stream)
+        xref[num] = (1, len(out), 0)
+        out += b"%d 0 obj\n%s\nstream\n%s\nendstream\nendobj\n" % (num, body, stream)
+
+    # One object stream for every non-stream object
+    next_num = len(order) + 1
+    if packed:
+        header, bodies = [], bytearray()
+        for index, (num, body) in enumerate(packed):
+            header.append(b"%d %d" % (num, len(bodies)))
+            bodies += body + b"\n"
+            xref[num] = (2, next_num, index)
+        first = b" ".join(header) + b"\n"
+        content = zlib.compress(first + bytes(bodies), 9)
+        xref[next_num] = (1, len(out), 0)
+        out += (b"%d 0 obj\n<</Type /ObjStm /N %d /First %d /Filter /FlateDecode /Length %d>>\nstream\n"
+                % (next_num, len(packed), len(first), len(content)))
+        out += content + b"\nendstream\nendobj\n"
+        next_num += 1
+
+    # Cross-reference stream (describes itself as the last entry)
+    xref_at = len(out)
+    xref[next_num] = (1, xref_at, 0)
+    rows = zlib.compress(b"".join(struct.pack(">BIH", *xref[n]) for n in range(next_num + 1)), 9)
+    info_ref = b" /Info %d 0 R" % mapping[info] if info in mapping else b""
+    out += (b"%d 0 obj\n<</Type /XRef /Size %d /W [1 4 2] /Root %d 0 R%s /Filter /FlateDecode /Length %d>>\n"
+            b"stream\n" % (next_num, next_num + 1, mapping[root], info_ref, len(rows)))
+    out += rows + b"\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n" % xref_at
+    return bytes(out)
+
+
+# =============================================================================
+# 5. MULTI-VARIANT (TAILORED) GENERATION
+# =============================================================================
+
+def parse_variant_specs(raw: str) -> list:
+    """
+    Parses the variants text box into a list of {'name', 'target'} dicts.
+    Variants are separated by a line containing only '---'. The first line of
+    each block is the variant name, the rest is a tag list or a job description.
+    """
+    variants = []
+    for block in re.split(r"^\s*-{3,}\s*$", raw or "", flags=re.MULTILINE):
+        lines = block.strip().split('\n')
+        if not lines or not lines[0].strip():
+            continue
+        name = lines[0].strip()
+        target = "\n".join(lines[1:]).strip() or name
+        variants.append({'name': name, 'target': target})
+    return variants
+
+
+def collect_profile_tags(content) -> set:
+    """Returns every tag used on items and bullets of the prepared profile."""
+    tags = set()
+    for key in TAGGED_SECTIONS:
+        for item in content['sections'][key]:
+            tags |= item['tags']
+            for _text, bullet_tags in item.get('desc', []):
+                tags |= bullet_tags
+    return tags
+
+
+def resolve_target_tags(target: str, known_tags: set) -> set:
+    """Finds which profile tags a target (tag list or job description) mentions."""
+    text = target.lower()
+    return {tag for tag in known_tags
+            if re.search(r"(?<![\w])" + re.escape(tag) + r"(?![\w])", text)}
+
+
+def select_variant_content(content, targets: set):
+    """
+    Builds the content of one variant from the shared prepared profile.
+    Untagged items and bullets are always kept; tagged ones only when they match.
+    Experience keeps its (reverse-chronological) order; Projects are ordered by
+    relevance (matched tags), keeping the original order on ties.
+    If no target tag is matched, the full profile is used unchanged.
+    """
+    if not targets:
+        return content
+
+    sections = dict(content['sections'])
+    for key in TAGGED_SECTIONS:
+        scored = []
+        for item in content['sections'][key]:
+            if item['tags'] and not item['tags'] & targets:
+                continue
+            bullets = [b for b in item.get('desc', []) if not b[1] or b[1] & targets]
+            score = len(item['tags'] & targets) + sum(1 for b in bullets if b[1])
+            scored.append((score, {**item, 'desc': bullets}))
+        if key in RELEVANCE_ORDERED_SECTIONS:
+            scored.sort(key=lambda pair: -pair[0])
+        sections[key] = [item for _score, item in scored]
+
+    return {'personal': content['personal'], 'sections': sections}
+
+
+def render_resume_bytes(content, optimize=False) -> bytes:
+    """
+    Renders prepared content straight to PDF bytes.
+    Module level (and fed only plain data), so it can run in a worker process.
+    """
+    return pdf_to_bytes(render_prepared_resume(content, optimize=optimize))
+
+
+def build_resume_variants_zip(personal_info, sections_data, variants, optimize=False, executor=None):
+    """
+    Generates one tailored PDF per variant and returns them as a zip stream,
+    plus the names of the variants whose target matched no profile tag (those
+    hold the full, untailored profile).
+    The profile is normalized once and shared by all variants. With an
+    `executor` (e.g. a ProcessPoolExecutor) the variants are rendered in
+    parallel; PDF layout is pure Python, so threads would not help.
+    """
+    content = prepare_resume_content(personal_info, sections_data)
+    known_tags = collect_profile_tags(content)
+    targets = [resolve_target_tags(v['target'], known_tags) for v in variants]
+    unmatched = [v['name'] for v, tags in zip(variants, targets) if not tags]
+    selected = [select_variant_content(content, tags) for tags in targets]
+
+    render = executor.map if executor is not None else map
+    rendered = list(render(render_resume_bytes, selected, [optimize] * len(selected)))
+
+    base_name = re.sub(r"\W+", "_", personal_info['name']).strip('_') or "Resume"
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        used_names = set()
+        for variant, pdf_data in zip(variants, rendered):
+            slug = re.sub(r"\W+", "_", variant['name']).strip('_') or "Variant"
+            file_name = f"{base_name}_{slug}.pdf"
+            suffix = 2
+            while file_name in used_names:
+                file_name = f"{base_name}_{slug}_{suffix}.pdf"
+                suffix += 1
+            used_names.add(file_name)
+            archive.writestr(file_name, pdf_data)
+
+    buffer.seek(0)
+    return buffer, unmatched
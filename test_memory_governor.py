@@ -0,0 +1,132 @@
+"""
+Tests for the session memory governor (ATS_website.SessionMemoryGovernor).
+
+Run with:
+    python -m pytest -q test_memory_governor.py
+
+Streamlit's runtime and the clock are replaced by fakes, so sessions can be
+disconnected and time advanced without a server.
+"""
+
+import os
+import stat
+import time
+import types
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import ATS_website as app
+
+ITEMS = [{'title': 'Backend Engineer', 'company': 'Acme', 'date': 'Jan 2020 - Present', 'desc': '', 'tags': []}]
+
+
+class FakeState(dict):
+    """Stands in for Streamlit's SessionState (the governor reads `filtered_state`)."""
+
+    @property
+    def filtered_state(self):
+        return dict(self)
+
+
+class FakeRuntime:
+    """The part of streamlit.runtime the governor uses: which sessions are connected."""
+
+    def __init__(self):
+        self.connected = set()
+
+    def exists(self):
+        return True
+
+    def get_instance(self):
+        return self
+
+    def is_active_session(self, session_id):
+        return session_id in self.connected
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(app, "time", types.SimpleNamespace(monotonic=lambda: clock.now, time=time.time))
+    fake_runtime = FakeRuntime()
+    monkeypatch.setattr(app, "runtime", fake_runtime)
+    store = tmp_path / "drafts"
+    governor = app.SessionMemoryGovernor(ceiling_bytes=10 ** 9, idle_seconds=60, draft_dir=str(store))
+    return types.SimpleNamespace(governor=governor, runtime=fake_runtime, clock=clock, store=store)
+
+
+def rerun(env, session_id, state, advance=0.0):
+    """One script run of `session_id`: begin, then end (which applies the policies)."""
+    env.clock.now += advance
+    env.runtime.connected.add(session_id)
+    snapshot = env.governor.begin_run(session_id, state)
+    if snapshot:
+        state.update(snapshot)
+    env.governor.end_run(session_id, 1000)
+    return snapshot
+
+
+def compacted_session(env):
+    """Session A with saved items, left idle until the governor compacts it."""
+    state = FakeState(experience=list(ITEMS), edit_target=None)
+    rerun(env, 'A', state)
+    rerun(env, 'B', FakeState(), advance=app.IDLE_COMPACT_SECONDS)  # Sweep: A is idle
+    rerun(env, 'B', FakeState(), advance=env.governor.idle_seconds + app.GOVERNOR_SWEEP_SECONDS)
+    assert 'experience' not in state
+    return state
+
+
+def test_compact_disconnect_reconnect_restores(env):
+    state = compacted_session(env)
+
+    # The tab drops its socket; Streamlit keeps the session for a reconnect
+    env.runtime.connected.discard('A')
+    rerun(env, 'B', FakeState(), advance=app.GOVERNOR_SWEEP_SECONDS)
+    rerun(env, 'B', FakeState(), advance=app.GOVERNOR_SWEEP_SECONDS)
+    assert {row['session']: row['status'] for row in env.governor.stats()['sessions']}['A'] == 'compacted'
+    assert os.listdir(env.store) == []
+
+    assert rerun(env, 'A', state) == {'experience': ITEMS, 'edit_target': None}
+    assert state['experience'] == ITEMS
+
+
+def test_forgotten_session_restores_from_draft_store(env):
+    state = compacted_session(env)
+
+    env.runtime.connected.discard('A')
+    rerun(env, 'B', FakeState(), advance=app.GOVERNOR_SWEEP_SECONDS)  # Disconnect noticed
+    rerun(env, 'B', FakeState(), advance=app.DISCONNECTED_KEEP_SECONDS + app.GOVERNOR_SWEEP_SECONDS)
+
+    assert 'A' not in [row['session'] for row in env.governor.stats()['sessions']]
+    drafts = os.listdir(env.store)
+    assert drafts == ['A.json.z']
+    assert stat.S_IMODE(os.stat(env.store / drafts[0]).st_mode) == 0o600
+
+    assert rerun(env, 'A', state)['experience'] == ITEMS
+    assert os.listdir(env.store) == []
+
+
+def test_ceiling_eviction_restores_from_draft_store(env):
+    state = FakeState(experience=list(ITEMS))
+    rerun(env, 'A', state)
+    env.governor.ceiling_bytes = 1
+    rerun(env, 'B', FakeState())
+
+    assert 'experience' not in state
+    assert stat.S_IMODE(os.stat(env.store).st_mode) == 0o700
+    assert 'A.json.z' in os.listdir(env.store)
+
+    env.governor.ceiling_bytes = 10 ** 9
+    assert rerun(env, 'A', state)['experience'] == ITEMS
+
+
+@pytest.mark.parametrize("given, shown", [("secret", True), ("wrong", False), ("\u00e9\u2603", False)])
+def test_memory_monitor_token(given, shown):
+    at = AppTest.from_file(app.__file__, default_timeout=30)
+    at.secrets["memory_monitor_token"] = "secret"
+    at.query_params["monitor"] = given
+    at.run()
+
+    assert not at.exception
+    assert any("Memory Monitor" in panel.label for panel in at.expander) == shown